@@ -0,0 +1,40 @@
+import argparse
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app", description="Resume Extractor")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("serve", help="Start the API server (settings from environment variables)")
+
+    bulk = subparsers.add_parser("bulk", help="Extract every PDF in a directory or archive to JSON Lines")
+    bulk.add_argument("input", help="Directory, zip/tar archive or single PDF file")
+    bulk.add_argument("-o", "--output", required=True,
+                      help="JSON Lines output file; also the checkpoint for resuming an interrupted run")
+    bulk.add_argument("-w", "--workers", type=int, default=0, help="Worker processes (default: one per CPU)")
+    bulk.add_argument("--retry-errors", action="store_true",
+                      help="Process files again that failed in a previous run")
+    bulk.add_argument("--fields", help="Comma-separated fields to extract (default: all)")
+    bulk.add_argument("--batch-size", type=int, default=8,
+                      help="Files per worker task; NER runs over a whole batch at once (default: 8)")
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        from app.server import run
+        run()
+    elif args.command == "bulk":
+        from app.bulk import BulkExtractor
+        fields = [field.strip() for field in args.fields.split(",") if field.strip()] if args.fields else None
+        try:
+            extractor = BulkExtractor(
+                args.output, workers=args.workers, retry_errors=args.retry_errors, fields=fields,
+                batch_size=args.batch_size,
+            )
+        except ValueError as e:
+            parser.error(str(e))
+        extractor.run(args.input)
+
+
+if __name__ == "__main__":
+    main()
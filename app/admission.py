@@ -0,0 +1,144 @@
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException, Request, Response
+
+from app import config
+from app.metrics import SharedCounters
+
+
+class AdmissionController:
+    """
+    Concurrency and queue-depth limit for a single endpoint.
+
+    At most `max_concurrency` requests run at once and at most `max_queue`
+    more wait for a slot. Anything beyond that is rejected immediately with
+    503 and a Retry-After header instead of piling up until the client times
+    out. Each request carries a deadline; requests still queued when it
+    passes (or whose client has disconnected) are dropped before any
+    extraction work is done.
+
+    Limits apply per worker process; the counters are shared across workers.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        max_queue: int,
+        retry_after: int = config.ADMISSION_RETRY_AFTER,
+        default_timeout: float = config.ADMISSION_DEFAULT_TIMEOUT,
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.default_timeout = default_timeout
+        self.active = 0
+        self.queued = 0
+        # Requests admitted to the queue or running. Counted synchronously on
+        # arrival: the semaphore is only acquired in another task, so a burst
+        # arriving in the same tick would all see it unlocked.
+        self.in_flight = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.counters = SharedCounters([
+            "admitted",
+            "rejected",
+            "expired",
+            "queue_wait_ms",
+            "service_ms",
+        ])
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so that it binds to the worker's event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def request_timeout(self, request: Request) -> float:
+        """Seconds the client is willing to wait, from the X-Request-Timeout header"""
+        value = request.headers.get("x-request-timeout")
+        if value:
+            try:
+                timeout = float(value)
+                if timeout > 0 and math.isfinite(timeout):
+                    return timeout
+            except ValueError:
+                pass
+        return self.default_timeout
+
+    @asynccontextmanager
+    async def admit(self, request: Request, response: Response):
+        """
+        Wait for an execution slot, rejecting the request if the queue is full
+        or its deadline passes first. Queue wait and service time are reported
+        separately in the Server-Timing response header.
+        """
+        arrived = time.monotonic()
+        deadline = arrived + self.request_timeout(request)
+
+        if self.in_flight >= self.max_concurrency + self.max_queue:
+            self.counters.incr("rejected")
+            raise HTTPException(
+                status_code=503,
+                detail=f"Server is overloaded ({self.name} queue is full). Please retry later.",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+
+        self.in_flight += 1
+        try:
+            self.queued += 1
+            try:
+                await asyncio.wait_for(self.semaphore.acquire(), timeout=deadline - arrived)
+            except asyncio.TimeoutError:
+                self.counters.incr("expired")
+                raise HTTPException(
+                    status_code=503,
+                    detail="Request deadline expired while waiting in the queue.",
+                    headers={"Retry-After": str(self.retry_after)},
+                )
+            finally:
+                self.queued -= 1
+
+            started = time.monotonic()
+            queue_wait_ms = (started - arrived) * 1000
+            try:
+                if started >= deadline or await request.is_disconnected():
+                    self.counters.incr("expired")
+                    raise HTTPException(
+                        status_code=503,
+                        detail="Request deadline expired before extraction started.",
+                        headers={"Retry-After": str(self.retry_after)},
+                    )
+
+                self.counters.incr("admitted")
+                self.active += 1
+                try:
+                    yield
+                finally:
+                    self.active -= 1
+                    service_ms = (time.monotonic() - started) * 1000
+                    self.counters.incr("queue_wait_ms", int(queue_wait_ms))
+                    self.counters.incr("service_ms", int(service_ms))
+                    response.headers["Server-Timing"] = (
+                        f"queue;dur={queue_wait_ms:.1f}, service;dur={service_ms:.1f}"
+                    )
+            finally:
+                self.semaphore.release()
+        finally:
+            self.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = self.counters.snapshot()
+        stats.update({
+            "active": self.active,
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+        })
+        return stats
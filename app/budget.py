@@ -0,0 +1,129 @@
+import asyncio
+import contextvars
+import math
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Coroutine, Optional, Set
+
+from fastapi import Request
+
+from app import config
+
+_current: ContextVar[Optional["LatencyBudget"]] = ContextVar("latency_budget", default=None)
+
+LOCAL_FALLBACK_REASON = "Gemini did not answer within the latency budget; returning the local extraction."
+
+# Background tasks started with run_detached; referenced here so they aren't garbage collected
+_background: Set[asyncio.Task] = set()
+
+
+class LatencyBudget:
+    """
+    How long a request may spend before it has to answer. Gemini calls made
+    while the budget is active are bounded by it, and the services fall back to
+    the local extraction (marking the response as degraded) when it runs out.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.deadline = time.monotonic() + seconds
+        self.degraded_reason: Optional[str] = None
+
+    def remaining(self) -> float:
+        return self.deadline - time.monotonic()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def mark_degraded(self, reason: str) -> None:
+        self.degraded_reason = reason
+
+    @property
+    def degraded(self) -> bool:
+        return self.degraded_reason is not None
+
+    @contextmanager
+    def activate(self):
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+
+def get_latency_budget(request: Request) -> Optional[LatencyBudget]:
+    """
+    FastAPI dependency: the request's latency budget in seconds, from the
+    X-Latency-Budget header or RESUME_LATENCY_BUDGET, and never longer than the
+    client's X-Request-Timeout. None when there is no budget (0 disables it).
+    """
+    seconds = _header_seconds(request, "x-latency-budget")
+    if seconds is None:
+        seconds = config.LATENCY_BUDGET
+    client_timeout = _header_seconds(request, "x-request-timeout")
+    if client_timeout is not None:
+        seconds = min(seconds, client_timeout) if seconds > 0 else client_timeout
+    return LatencyBudget(seconds) if seconds > 0 else None
+
+
+def _header_seconds(request: Request, name: str) -> Optional[float]:
+    value = request.headers.get(name)
+    if value:
+        try:
+            seconds = float(value)
+            if seconds > 0 and math.isfinite(seconds):
+                return seconds
+        except ValueError:
+            pass
+    return None
+
+
+def activate(budget: Optional[LatencyBudget]):
+    """Context manager that applies the budget to the enclosed block (no-op for None)"""
+    if budget is None:
+        return nullcontext()
+    return budget.activate()
+
+
+def current() -> Optional[LatencyBudget]:
+    return _current.get()
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current request's budget, or None if it has none"""
+    budget = _current.get()
+    return budget.remaining() if budget is not None else None
+
+
+def expired() -> bool:
+    budget = _current.get()
+    return budget is not None and budget.expired()
+
+
+def mark_degraded(reason: str) -> None:
+    budget = _current.get()
+    if budget is not None:
+        budget.mark_degraded(reason)
+
+
+def run_detached(coro: Coroutine) -> Optional[asyncio.Task]:
+    """
+    Run a coroutine in the background, outside of the current request: it gets
+    a fresh context, so neither the request's budget nor its profiler apply.
+    Instead it runs under its own budget of BACKGROUND_BUDGET seconds, so a
+    hung backend can't hold a background slot forever.
+    Returns None (and drops the coroutine) when too many are already running.
+    """
+    if len(_background) >= config.MAX_BACKGROUND_TASKS:
+        coro.close()
+        return None
+    task = contextvars.Context().run(asyncio.ensure_future, _with_budget(coro, config.BACKGROUND_BUDGET))
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+    return task
+
+
+async def _with_budget(coro: Coroutine, seconds: float):
+    with activate(LatencyBudget(seconds) if seconds > 0 else None):
+        return await coro
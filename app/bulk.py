@@ -0,0 +1,175 @@
+import hashlib
+import json
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from app.extractors.pdf_extractor import PDFExtractor
+
+# Extractor used by each pool worker, created once per process
+_worker_extractor: Optional[PDFExtractor] = None
+_worker_fields: Optional[List[str]] = None
+
+
+def _init_worker(fields: Optional[List[str]] = None) -> None:
+    global _worker_extractor, _worker_fields
+    _worker_extractor = PDFExtractor()
+    _worker_fields = fields
+
+
+def _extract_batch(batch: List[Tuple[str, str, bytes]]) -> List[Dict[str, Any]]:
+    """Extract a chunk of (source, sha256, content) files, with their NER snippets tagged together"""
+    results = _worker_extractor.extract_many([content for _, _, content in batch], _worker_fields)
+    records = []
+    for (source, digest, _), result in zip(batch, results):
+        if isinstance(result, Exception):
+            records.append({"sha256": digest, "source": source, "error": f"{type(result).__name__}: {result}"})
+        else:
+            records.append({"sha256": digest, "source": source, "resume": result.model_dump(mode="json")})
+    return records
+
+
+def iter_pdfs(path: str) -> Iterator[Tuple[str, bytes]]:
+    """Yield (name, content) for every PDF in a directory, zip archive or tar archive"""
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for filename in sorted(files):
+                if filename.lower().endswith(".pdf"):
+                    file_path = os.path.join(root, filename)
+                    with open(file_path, "rb") as f:
+                        yield file_path, f.read()
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and info.filename.lower().endswith(".pdf"):
+                    yield f"{path}:{info.filename}", archive.read(info)
+    elif tarfile.is_tarfile(path):
+        with tarfile.open(path) as archive:
+            for member in archive:
+                if member.isfile() and member.name.lower().endswith(".pdf"):
+                    yield f"{path}:{member.name}", archive.extractfile(member).read()
+    elif path.lower().endswith(".pdf"):
+        with open(path, "rb") as f:
+            yield path, f.read()
+    else:
+        raise ValueError(f"Not a directory, zip/tar archive or PDF file: {path}")
+
+
+def load_checkpoint(output_path: str, retry_errors: bool = False) -> Set[str]:
+    """
+    Content hashes already present in the output file. The JSON Lines output
+    doubles as the checkpoint: a re-run appends to it and skips these files
+    (except failed ones when `retry_errors` is set). A line truncated by an
+    interrupted run is dropped.
+    """
+    done: Set[str] = set()
+    if not os.path.exists(output_path):
+        return done
+    valid_size = 0
+    with open(output_path, "rb") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                if not (retry_errors and "error" in record):
+                    done.add(record["sha256"])
+            except (ValueError, KeyError):
+                break
+            valid_size += len(line)
+    if valid_size != os.path.getsize(output_path):
+        with open(output_path, "r+b") as f:
+            f.truncate(valid_size)
+    return done
+
+
+class BulkExtractor:
+    """
+    Offline extraction of many resumes with a pool of worker processes.
+
+    Results are appended to a JSON Lines file, one object per input file with
+    its content hash, source name and either the extracted resume or an error.
+    Files are sent to the workers in chunks of `batch_size` so that NER runs
+    over a whole chunk at once.
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        workers: int = 0,
+        retry_errors: bool = False,
+        fields: Optional[List[str]] = None,
+        progress_interval: float = 1.0,
+        batch_size: int = 8,
+    ):
+        self.output_path = output_path
+        self.retry_errors = retry_errors
+        # Validate the field names up front rather than failing every file
+        PDFExtractor().resolve_fields(fields)
+        self.fields = fields
+        self.workers = workers or os.cpu_count() or 1
+        self.progress_interval = progress_interval
+        self.batch_size = max(1, batch_size)
+        self.stats = {"processed": 0, "errors": 0, "skipped": 0}
+
+    def run(self, input_path: str) -> Dict[str, int]:
+        seen = load_checkpoint(self.output_path, self.retry_errors)
+        max_pending = self.workers * 2
+        pending = set()
+        batch: List[Tuple[str, str, bytes]] = []
+        self._start = time.monotonic()
+        self._last_report = 0.0
+
+        with open(self.output_path, "a", encoding="utf-8") as output, \
+                ProcessPoolExecutor(
+                    max_workers=self.workers, initializer=_init_worker, initargs=(self.fields,)
+                ) as pool:
+            for source, content in iter_pdfs(input_path):
+                digest = hashlib.sha256(content).hexdigest()
+                if digest in seen:
+                    self.stats["skipped"] += 1
+                    continue
+                seen.add(digest)
+                batch.append((source, digest, content))
+                if len(batch) < self.batch_size:
+                    continue
+                pending.add(pool.submit(_extract_batch, batch))
+                batch = []
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    self._write(output, done)
+            if batch:
+                pending.add(pool.submit(_extract_batch, batch))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                self._write(output, done)
+
+        self._report(final=True)
+        return self.stats
+
+    def _write(self, output, futures) -> None:
+        for future in futures:
+            for result in future.result():
+                if "error" in result:
+                    self.stats["errors"] += 1
+                self.stats["processed"] += 1
+                output.write(json.dumps(result, ensure_ascii=False) + "\n")
+        output.flush()
+        self._report()
+
+    def _report(self, final: bool = False) -> None:
+        elapsed = time.monotonic() - self._start
+        if not final and elapsed - self._last_report < self.progress_interval:
+            return
+        self._last_report = elapsed
+        rate = self.stats["processed"] / elapsed if elapsed else 0.0
+        sys.stderr.write(
+            f"\r{self.stats['processed']} processed ({rate:.1f} files/s), "
+            f"{self.stats['skipped']} skipped, {self.stats['errors']} errors"
+        )
+        if final:
+            sys.stderr.write(f" in {elapsed:.1f}s\n")
+        sys.stderr.flush()
@@ -0,0 +1,144 @@
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Environment variable {name} must be an integer, got: {value}")
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"Environment variable {name} must be a number, got: {value}")
+
+
+def _env_list(name: str) -> list:
+    value = os.getenv(name, "")
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Server settings
+HOST = os.getenv("RESUME_HOST", "0.0.0.0")
+PORT = _env_int("RESUME_PORT", 8000)
+
+# Number of worker processes. 1 keeps the plain single-process uvicorn server,
+# 0 means one worker per CPU this process is allowed to run on.
+WORKERS = _env_int("RESUME_WORKERS", 1)
+
+# Restart a worker after it has served this many requests (0 disables).
+# A random jitter is added so workers don't all restart at the same time.
+MAX_REQUESTS_PER_WORKER = _env_int("RESUME_MAX_REQUESTS_PER_WORKER", 0)
+MAX_REQUESTS_JITTER = _env_int("RESUME_MAX_REQUESTS_JITTER", 0)
+
+# Pin each worker to one of the CPUs available to the parent process
+CPU_AFFINITY = _env_bool("RESUME_CPU_AFFINITY", False)
+
+# A worker that crashes (non-zero exit or a signal) within WORKER_MIN_UPTIME
+# seconds of being started counts as a failed start. Its replacement is delayed exponentially (1s, 2s, 4s, ...
+# up to WORKER_MAX_BACKOFF), and the server stops after WORKER_MAX_FAILED_STARTS
+# failed starts in a row in the same slot (0 keeps retrying).
+WORKER_MIN_UPTIME = _env_float("RESUME_WORKER_MIN_UPTIME", 10.0)
+WORKER_MAX_BACKOFF = _env_float("RESUME_WORKER_MAX_BACKOFF", 30.0)
+WORKER_MAX_FAILED_STARTS = _env_int("RESUME_WORKER_MAX_FAILED_STARTS", 5)
+
+# Admission control for the extraction endpoints (limits are per worker).
+# Requests beyond max concurrency + max queue are rejected with 503.
+ADMISSION_LIMITS = {
+    "extract": {
+        "max_concurrency": _env_int("RESUME_EXTRACT_MAX_CONCURRENCY", 4),
+        "max_queue": _env_int("RESUME_EXTRACT_MAX_QUEUE", 16),
+    },
+    "gemini_extract": {
+        "max_concurrency": _env_int("RESUME_GEMINI_EXTRACT_MAX_CONCURRENCY", 8),
+        "max_queue": _env_int("RESUME_GEMINI_EXTRACT_MAX_QUEUE", 32),
+    },
+    "gemini_direct": {
+        "max_concurrency": _env_int("RESUME_GEMINI_DIRECT_MAX_CONCURRENCY", 8),
+        "max_queue": _env_int("RESUME_GEMINI_DIRECT_MAX_QUEUE", 32),
+    },
+    "match": {
+        "max_concurrency": _env_int("RESUME_MATCH_MAX_CONCURRENCY", 4),
+        "max_queue": _env_int("RESUME_MATCH_MAX_QUEUE", 64),
+    },
+}
+# Seconds a client is assumed to wait when it doesn't send X-Request-Timeout
+ADMISSION_DEFAULT_TIMEOUT = _env_float("RESUME_REQUEST_TIMEOUT", 30.0)
+# Value of the Retry-After header on rejected requests, in seconds
+ADMISSION_RETRY_AFTER = _env_int("RESUME_RETRY_AFTER", 1)
+
+# Gemini API. The key is required (the Gemini services refuse to start without
+# one). GEMINI_API_BASE_URL switches the services from the SDK to the REST API
+# at that address (e.g. a local fake Gemini server for load tests).
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+GEMINI_API_BASE_URL = os.getenv("GEMINI_API_BASE_URL", "")
+
+# Per-request profiling: requests with an X-Profile-Token header equal to this
+# token are run under cProfile and get a profile summary in the response.
+# Profiling is disabled when no token is configured.
+PROFILING_TOKEN = os.getenv("RESUME_PROFILING_TOKEN", "")
+# If set, the raw cProfile stats of each profiled request are also saved here
+PROFILE_DIR = os.getenv("RESUME_PROFILE_DIR", "")
+
+# Region used to parse phone numbers written without a country code (ISO 3166 code)
+PHONE_DEFAULT_REGION = os.getenv("RESUME_PHONE_DEFAULT_REGION", "US")
+
+# Pool of Gemini backends for latency-aware routing: every combination of the
+# comma-separated keys, models and base URLs is one backend. Defaults to the
+# single backend configured above. With several API keys and no base URL the
+# public Gemini REST endpoint is used, since the SDK only holds one key.
+GEMINI_API_KEYS = _env_list("GEMINI_API_KEYS") or [GEMINI_API_KEY]
+GEMINI_MODELS = _env_list("GEMINI_MODELS") or [GEMINI_MODEL]
+GEMINI_API_BASE_URLS = _env_list("GEMINI_API_BASE_URLS") or [GEMINI_API_BASE_URL]
+GEMINI_REST_URL = "https://generativelanguage.googleapis.com"
+# Fire a hedged duplicate request on another backend when the first one is
+# slower than this percentile of its recent latencies (0 disables hedging)
+GEMINI_HEDGE_PERCENTILE = _env_float("GEMINI_HEDGE_PERCENTILE", 95.0)
+# Backends whose recent error rate is above this are skipped while others are healthy
+GEMINI_MAX_ERROR_RATE = _env_float("GEMINI_MAX_ERROR_RATE", 0.5)
+
+# SQLite file with per-candidate snapshots for incremental re-extraction
+INCREMENTAL_DB_PATH = os.getenv("RESUME_INCREMENTAL_DB", ".cache/extraction_cache.sqlite3")
+
+# spaCy pipeline used to recognize person and organisation names (e.g.
+# en_core_web_sm). Empty disables NER and keeps the regex-only extraction.
+NER_MODEL = os.getenv("RESUME_NER_MODEL", "")
+# Number of snippets tagged per nlp.pipe batch
+NER_BATCH_SIZE = _env_int("RESUME_NER_BATCH_SIZE", 64)
+
+# Pre-parse triage: uploads above these limits are rejected before parsing (0 disables)
+TRIAGE_MAX_BYTES = _env_int("RESUME_MAX_UPLOAD_BYTES", 10 * 1024 * 1024)
+TRIAGE_MAX_PAGES = _env_int("RESUME_MAX_PAGES", 20)
+
+# Latency budget of a request in seconds (clients can override it with the
+# X-Latency-Budget header). When it runs out before Gemini answers, the local
+# extraction is returned marked as degraded. 0 disables the budget.
+LATENCY_BUDGET = _env_float("RESUME_LATENCY_BUDGET", 10.0)
+# Finish Gemini calls that ran over the budget in the background so the result
+# is cached for the next request with the same file (0 disables)
+MAX_BACKGROUND_TASKS = _env_int("RESUME_MAX_BACKGROUND_TASKS", 16)
+# Latency budget of each of those background calls in seconds
+BACKGROUND_BUDGET = _env_float("RESUME_BACKGROUND_BUDGET", 60.0)
+# Their results are cached by file content for this many seconds, and at most
+# this many per service are kept (oldest evicted first). 0 disables a limit.
+LATE_RESULT_TTL = _env_float("RESUME_LATE_RESULT_TTL", 24 * 3600.0)
+LATE_RESULT_MAX_ENTRIES = _env_int("RESUME_LATE_RESULT_MAX_ENTRIES", 10000)
+
+# Weight of interview topics relative to skills when matching candidates to a job
+MATCH_TOPIC_WEIGHT = _env_float("RESUME_MATCH_TOPIC_WEIGHT", 0.5)
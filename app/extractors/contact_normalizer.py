@@ -0,0 +1,117 @@
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+import phonenumbers
+from email_validator import EmailNotValidError, validate_email
+
+from app import config
+
+
+@lru_cache(maxsize=65536)
+def _normalize_domain(domain: str) -> Optional[str]:
+    """Syntax-check and normalize an email domain. Memoized, since a handful of domains cover most emails."""
+    try:
+        return validate_email(f"postmaster@{domain}", check_deliverability=False).domain
+    except EmailNotValidError:
+        return None
+
+
+@lru_cache(maxsize=65536)
+def _normalize_address(email: str) -> Optional[str]:
+    try:
+        return validate_email(email, check_deliverability=False).normalized
+    except EmailNotValidError:
+        return None
+
+
+class ContactNormalizer:
+    """
+    Offline normalization of contact details.
+
+    Emails are validated for syntax only (no DNS deliverability lookup, so
+    nothing blocks on the network) and phone numbers are parsed with
+    `phonenumbers` and formatted as E.164, using `default_region` for
+    numbers written without a country code.
+    """
+
+    # PhoneNumberMatcher is slow, so it only scans this much of the text (the header)
+    matcher_chars = 2000
+
+    def __init__(self, default_region: str = config.PHONE_DEFAULT_REGION):
+        self.default_region = default_region.upper()
+        self.phone_pattern = re.compile(r'(\+\d{1,3}[-\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+
+    def normalize_email(self, email: str) -> Optional[str]:
+        """Return the normalized email address, or None if it isn't valid"""
+        local, sep, domain = email.strip().rpartition("@")
+        if not sep or not local:
+            return None
+        # Addresses with an invalid domain are rejected without validating the whole address
+        normalized_domain = _normalize_domain(domain.lower())
+        if normalized_domain is None:
+            return None
+        return _normalize_address(f"{local}@{normalized_domain}")
+
+    def normalize_phone(self, phone: str) -> Optional[str]:
+        """Parse a single phone number and return it in E.164 format, or None"""
+        try:
+            number = phonenumbers.parse(phone, self.default_region)
+        except phonenumbers.NumberParseException:
+            return None
+        if not phonenumbers.is_possible_number(number):
+            return None
+        return phonenumbers.format_number(number, phonenumbers.PhoneNumberFormat.E164)
+
+    def find_phones(self, text: str) -> List[str]:
+        """
+        All phone numbers in free text, in E.164 format and in order of
+        appearance. The cheap regex finds the common formats; only if it finds
+        nothing is `phonenumbers`' matcher run, and only over the start of the
+        text where contact details are.
+        """
+        phones = []
+        for match in self.phone_pattern.finditer(text):
+            phone = self.normalize_phone(match.group())
+            if phone and phone not in phones:
+                phones.append(phone)
+        if phones:
+            return phones
+        for match in phonenumbers.PhoneNumberMatcher(text[:self.matcher_chars], self.default_region):
+            phone = phonenumbers.format_number(match.number, phonenumbers.PhoneNumberFormat.E164)
+            if phone not in phones:
+                phones.append(phone)
+        return phones
+
+    def normalize_emails(self, emails: Iterable[str]) -> List[Optional[str]]:
+        """Batch version of normalize_email; repeated addresses are only validated once"""
+        cache: Dict[str, Optional[str]] = {}
+        results = []
+        for email in emails:
+            if email not in cache:
+                cache[email] = self.normalize_email(email)
+            results.append(cache[email])
+        return results
+
+    def normalize_phones(self, phones: Iterable[str]) -> List[Optional[str]]:
+        """Batch version of normalize_phone; repeated numbers are only parsed once"""
+        cache: Dict[str, Optional[str]] = {}
+        results = []
+        for phone in phones:
+            if phone not in cache:
+                cache[phone] = self.normalize_phone(phone)
+            results.append(cache[phone])
+        return results
+
+    def normalize_contacts(self, contacts: Iterable[Dict[str, str]]) -> List[Dict[str, Optional[str]]]:
+        """
+        Normalize many {"email": ..., "phone": ...} records in one call.
+        Missing or invalid values come back as None.
+        """
+        contacts = list(contacts)
+        emails = self.normalize_emails(c.get("email") or "" for c in contacts)
+        phones = self.normalize_phones(c.get("phone") or "" for c in contacts)
+        return [
+            {**contact, "email": email, "phone": phone}
+            for contact, email, phone in zip(contacts, emails, phones)
+        ]
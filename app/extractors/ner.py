@@ -0,0 +1,80 @@
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+from app import config
+
+Entity = Tuple[str, str]  # (label, text)
+
+
+@lru_cache(maxsize=None)
+def load_pipeline(model: str):
+    """
+    Load a spaCy pipeline once per process with every component that the
+    entity recognizer doesn't need disabled. Called in the parent of the
+    pre-fork server, so workers share the loaded model.
+    """
+    import spacy
+
+    nlp = spacy.load(model)
+    needed = {"ner", "entity_ruler"}
+    for name, component in nlp.pipeline:
+        # Keep shared embedding layers only if the NER component listens to them
+        if "ner" in getattr(component, "listening_components", []):
+            needed.add(name)
+    nlp.select_pipes(disable=[name for name in nlp.pipe_names if name not in needed])
+    return nlp
+
+
+class NERTagger:
+    """
+    Named entity recognition for short resume snippets (the header region and
+    the first lines of experience entries), used to find the candidate's name
+    and company names that the regexes miss.
+
+    Snippets are tagged in batches with `nlp.pipe`: `prefetch` tags many
+    snippets at once (e.g. from a whole batch of resumes) and `entities` then
+    answers from the cache, only tagging a snippet on its own on a miss.
+    """
+
+    def __init__(self, model: str = config.NER_MODEL, batch_size: int = config.NER_BATCH_SIZE,
+                 cache_size: int = 4096, nlp=None):
+        self.model = model
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self._nlp = nlp
+        self._cache: "OrderedDict[str, List[Entity]]" = OrderedDict()
+
+    @property
+    def nlp(self):
+        if self._nlp is None:
+            self._nlp = load_pipeline(self.model)
+        return self._nlp
+
+    def prefetch(self, snippets: Iterable[str]) -> None:
+        """Tag all snippets that aren't cached yet in a single nlp.pipe pass"""
+        missing = list(dict.fromkeys(s for s in snippets if s and s not in self._cache))
+        if not missing:
+            return
+        for snippet, doc in zip(missing, self.nlp.pipe(missing, batch_size=self.batch_size)):
+            self._store(snippet, [(ent.label_, ent.text.strip()) for ent in doc.ents])
+
+    def entities(self, snippet: str, label: Optional[str] = None) -> List[str]:
+        """Entity texts found in a snippet, optionally only those with the given label"""
+        if not snippet:
+            return []
+        if snippet not in self._cache:
+            self.prefetch([snippet])
+        else:
+            self._cache.move_to_end(snippet)
+        return [text for ent_label, text in self._cache[snippet] if label is None or ent_label == label]
+
+    def _store(self, snippet: str, entities: List[Entity]) -> None:
+        self._cache[snippet] = entities
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+def default_tagger() -> Optional[NERTagger]:
+    """The configured tagger, or None when NER is disabled (no RESUME_NER_MODEL)"""
+    return NERTagger() if config.NER_MODEL else None
@@ -1,20 +1,43 @@
 import re
 import PyPDF2
-import phonenumbers
-from typing import Dict, List, Any, Optional
+import hashlib
+from typing import Dict, Iterable, List, Any, Optional, Set, Tuple, Union
 import io
 import regex
-from email_validator import validate_email, EmailNotValidError
 
-from app.models.resume_model import Resume, Education, Experience, Project
+from app.extractors.contact_normalizer import ContactNormalizer
+from app.extractors.ner import NERTagger, default_tagger
+from app.models.resume_model import Resume, Education, Experience, Project, ExtractionSnapshot
+
+
+# Fields of Resume that can be requested, and the fields each one is computed from
+RESUME_FIELDS = [
+    "name", "email", "phone", "linkedin", "github", "skills",
+    "education", "experience", "projects", "achievements", "interview_topics",
+]
+FIELD_DEPENDENCIES = {
+    "interview_topics": ["skills"],
+}
+
+
+def keep_fields(resume: Resume, fields: Optional[Set[str]]) -> Resume:
+    """Reset every field not in `fields` to its default (None keeps all fields)"""
+    if fields is None:
+        return resume
+    defaults = Resume()
+    return resume.model_copy(update={
+        field: getattr(defaults, field) for field in RESUME_FIELDS if field not in fields
+    })
 
 
 class PDFExtractor:
-    def __init__(self):
+    def __init__(self, contact_normalizer: Optional[ContactNormalizer] = None, ner: Optional[NERTagger] = None):
+        self.contact_normalizer = contact_normalizer or ContactNormalizer()
+        # Named entity recognition for names and companies (None when disabled)
+        self.ner = ner if ner is not None else default_tagger()
         # Common patterns to search for
         self.patterns = {
             "email": r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-            "phone": r'(\+\d{1,3}[-\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
             "linkedin": r'linkedin\.com/in/[\w-]+',
             "github": r'github\.com/[\w-]+',
             "education_keywords": ["education", "academic", "university", "college", "degree", "bachelor", "master", "phd"],
@@ -54,18 +77,202 @@ class PDFExtractor:
             "Unit Testing", "CI/CD Pipelines", "Software Development Lifecycle",
             "Web Development", "Frontend Frameworks", "Backend Development"
         ]
+        
+        # Extraction step for each contact field
+        self._contact_extractors = {
+            "name": self._extract_name,
+            "email": self._extract_email,
+            "phone": self._extract_phone,
+            "linkedin": self._extract_linkedin,
+            "github": self._extract_github,
+        }
+        
+        # Extraction step for each section-based field
+        self._section_extractors = {
+            "education": self._extract_education,
+            "experience": self._extract_experience,
+            "skills": self._extract_skills,
+            "projects": self._extract_projects,
+            "achievements": self._extract_achievements,
+        }
 
 
-    def extract_from_pdf(self, file_content: bytes) -> Resume:
-        file_obj = io.BytesIO(file_content)
-        reader = PyPDF2.PdfReader(file_obj)
-        text = "\n".join(page.extract_text() or "" for page in reader.pages)
-        data = self._process_text(text)
+    def extract_from_pdf(self, file_content: bytes, fields: Optional[Iterable[str]] = None) -> Resume:
+        """
+        Extract a resume from PDF content. If `fields` is given, only those
+        fields (and the fields they depend on) are computed, and pages are
+        only read until all of them have been found.
+        """
+        needed = self.resolve_fields(fields)
+        text = self._read_text(file_content, needed)
+        data = self._process_text(text, needed)
         return Resume(**data)
     
+    def extract_many(
+        self, contents: List[bytes], fields: Optional[Iterable[str]] = None
+    ) -> List[Union[Resume, Exception]]:
+        """
+        Extract several resumes at once. The NER snippets of all of them are
+        tagged in one batch before the per-resume extraction runs. A file that
+        fails gets its exception in place of the resume.
+        """
+        needed = self.resolve_fields(fields)
+        texts: List[Union[str, Exception]] = []
+        for content in contents:
+            try:
+                texts.append(self._read_text(content, needed))
+            except Exception as e:
+                texts.append(e)
+        if self.ner is not None:
+            self.ner.prefetch(
+                snippet for text in texts if isinstance(text, str)
+                for snippet in self._ner_snippets(text, needed)
+            )
+        results: List[Union[Resume, Exception]] = []
+        for text in texts:
+            if isinstance(text, Exception):
+                results.append(text)
+                continue
+            try:
+                results.append(Resume(**self._process_text(text, needed)))
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    def _read_text(self, file_content: bytes, needed: Optional[Set[str]]) -> str:
+        reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+        if needed is None:
+            return "\n".join(page.extract_text() or "" for page in reader.pages)
+        return self._read_until_found(reader, needed)
+    
+    def resolve_fields(self, fields: Optional[Iterable[str]]) -> Optional[Set[str]]:
+        """Requested fields plus the fields they depend on (None means all fields)"""
+        if fields is None:
+            return None
+        needed = set()
+        for field in fields:
+            if field not in RESUME_FIELDS:
+                raise ValueError(f"Unknown field: {field}. Valid fields are: {', '.join(RESUME_FIELDS)}")
+            needed.add(field)
+            needed.update(FIELD_DEPENDENCIES.get(field, []))
+        return needed
+    
+    def _read_until_found(self, reader: PyPDF2.PdfReader, fields: Set[str]) -> str:
+        """Extract page text one page at a time, stopping once every field in `fields` is found"""
+        texts = []
+        for page in reader.pages:
+            texts.append(page.extract_text() or "")
+            if self._all_found("\n".join(texts), fields):
+                break
+        return "\n".join(texts)
+    
+    def _all_found(self, text: str, fields: Set[str]) -> bool:
+        """
+        Whether later pages can no longer change any of `fields`: contact details
+        have been found (the name is settled after the first 5 lines), and each
+        section is present and followed by another section.
+        """
+        sections = None
+        for field in fields:
+            if field == "name":
+                if len(text.splitlines()) < 5 and self._extract_name(text) is None:
+                    return False
+            elif field in self._contact_extractors:
+                if self._contact_extractors[field](text) is None:
+                    return False
+            elif field in self._section_extractors:
+                if sections is None:
+                    sections = self._split_into_sections(text)
+                section = self._find_section(sections, self.patterns[f"{field}_keywords"])
+                if section is None or section is list(sections.values())[-1]:
+                    return False
+        return True
+    
+    def extract_incremental(
+        self, file_content: bytes, previous: Optional[ExtractionSnapshot] = None
+    ) -> Tuple[Resume, ExtractionSnapshot, List[str]]:
+        """
+        Extract a revised resume, reusing the work done for its previous version.
+
+        Pages whose content stream is unchanged reuse their previously extracted
+        text, and the _extract_* step of a section only runs again if the
+        section's content changed. Name and contact details are cheap and are
+        always re-extracted.
+
+        Returns the resume, the snapshot to store for the next revision, and
+        the section fields that were recomputed.
+        """
+        page_cache = dict(zip(previous.page_fingerprints, previous.page_texts)) if previous else {}
+        page_fingerprints, page_texts = self._read_pages(file_content, page_cache)
+        text = "\n".join(page_texts)
+        
+        resume_data, section_fingerprints, recomputed = self._process_text_incremental(text, previous)
+        resume = Resume(**resume_data)
+        snapshot = ExtractionSnapshot(
+            page_fingerprints=page_fingerprints,
+            page_texts=page_texts,
+            section_fingerprints=section_fingerprints,
+            resume=resume,
+        )
+        return resume, snapshot, recomputed
+    
+    def _read_pages(self, file_content: bytes, page_cache: Dict[str, str]) -> Tuple[List[str], List[str]]:
+        """Text of every page, skipping text extraction for pages found in `page_cache`"""
+        reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+        fingerprints, texts = [], []
+        for page in reader.pages:
+            contents = page.get_contents()
+            fingerprint = hashlib.sha256(contents.get_data() if contents is not None else b"").hexdigest()
+            text = page_cache.get(fingerprint)
+            if text is None:
+                text = page.extract_text() or ""
+            fingerprints.append(fingerprint)
+            texts.append(text)
+        return fingerprints, texts
+    
+    def _process_text_incremental(
+        self, text: str, previous: Optional[ExtractionSnapshot]
+    ) -> Tuple[Dict[str, Any], Dict[str, str], List[str]]:
+        """
+        Like _process_text, but reuses previous results for unchanged sections.
+        Also returns the section fingerprints and the recomputed fields.
+        """
+        resume_data = {
+            "name": "Not Present",
+            "email": "Not Present",
+            "phone": "Not Present",
+            "linkedin": "Not Present",
+            "github": "Not Present",
+        }
+        if self.ner is not None:
+            self.ner.prefetch(self._ner_snippets(text))
+        resume_data.update(self._extract_contact_info(text))
+        
+        sections = self._split_into_sections(text)
+        fingerprints = {}
+        recomputed = []
+        for field, source in self._section_sources(text, sections).items():
+            fingerprints[field] = hashlib.sha256((source or "").encode("utf-8")).hexdigest()
+            if previous is not None and previous.section_fingerprints.get(field) == fingerprints[field]:
+                resume_data[field] = getattr(previous.resume, field)
+            else:
+                resume_data[field] = self._section_extractors[field](source) if source else []
+                recomputed.append(field)
+        
+        if previous is not None and "skills" not in recomputed:
+            resume_data["interview_topics"] = previous.resume.interview_topics
+        else:
+            resume_data["interview_topics"] = self._generate_interview_topics(resume_data["skills"])
+            recomputed.append("interview_topics")
+        
+        return resume_data, fingerprints, recomputed
+    
 
-    def _process_text(self, text: str) -> Dict[str, Any]:
-        """Process extracted text and structure into resume sections"""
+    def _process_text(self, text: str, fields: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """
+        Process extracted text and structure into resume sections. If `fields`
+        is given, only those fields are extracted (dependencies already resolved).
+        """
         resume_data = {
             "name": "Not Present",
             "email": "Not Present",
@@ -79,8 +286,65 @@ class PDFExtractor:
             "achievements": [],
             "interview_topics": []
         }
+        if self.ner is not None:
+            # Tag all snippets the name and experience steps look at in one batch
+            self.ner.prefetch(self._ner_snippets(text, fields))
+        resume_data.update(self._extract_contact_info(text, fields))
+        
+        section_fields = [field for field in self._section_extractors if fields is None or field in fields]
+        if section_fields:
+            # Split text into sections
+            sections = self._split_into_sections(text)
+            
+            # Extract each section-based field from the section it lives in
+            for field, source in self._section_sources(text, sections).items():
+                if source and field in section_fields:
+                    resume_data[field] = self._section_extractors[field](source)
+        
+        # Generate interview topics based on skills
+        if fields is None or "interview_topics" in fields:
+            resume_data["interview_topics"] = self._generate_interview_topics(resume_data["skills"])
+        
+        return resume_data
+    
+    def _extract_contact_info(self, text: str, fields: Optional[Set[str]] = None) -> Dict[str, str]:
+        """Extract name and contact details; only fields that were found are returned"""
+        contact = {}
+        for field, extractor in self._contact_extractors.items():
+            if fields is None or field in fields:
+                value = extractor(text)
+                if value:
+                    contact[field] = value
+        return contact
+    
+    def _ner_snippets(self, text: str, fields: Optional[Set[str]] = None) -> List[str]:
+        """Snippets that NER is run on: the header region and the first lines of experience entries"""
+        snippets = []
+        if fields is None or "name" in fields:
+            snippets.append(self._header_region(text))
+        if fields is None or "experience" in fields:
+            experience = self._find_section(self._split_into_sections(text), self.patterns["experience_keywords"])
+            if experience:
+                for entry in re.split(r'\n\s*\n', experience):
+                    snippets.append(self._experience_candidate_lines(entry))
+        return [snippet for snippet in snippets if snippet]
+    
+    def _header_region(self, text: str) -> str:
+        """The first 5 lines, where the candidate's name is expected"""
+        return "\n".join(text.splitlines()[:5]).strip()
+    
+    def _experience_candidate_lines(self, entry: str) -> str:
+        """The first 2 lines of an experience entry, where the company is expected"""
+        return "\n".join(entry.strip().splitlines()[:2]).strip()
+    
+    def _extract_name(self, text: str) -> Optional[str]:
+        """Extract name (usually at the beginning of the resume)"""
+        # Prefer a multi-word PERSON entity on a single line of the header
+        if self.ner is not None:
+            for person in self.ner.entities(self._header_region(text), "PERSON"):
+                if "\n" not in person and len(person.split()) >= 2 and len(person) < 40:
+                    return person
         
-        # Extract name (usually at the beginning of the resume)
         # Look for name in first few lines
         lines = text.splitlines()
         for i, line in enumerate(lines[:5]):  # Check first 5 lines for name
@@ -88,82 +352,46 @@ class PDFExtractor:
             if line and len(line) < 40:  # Names are typically short
                 # Pattern for first and last name with possible middle name/initial
                 if re.match(r'^[A-Z][a-z]+(?:\s+[A-Z]\.?)?\s+[A-Z][a-z]+$', line):
-                    resume_data["name"] = line
-                    break
+                    return line
                 # Pattern for ALL CAPS name
                 elif re.match(r'^[A-Z]{2,}(?:\s+[A-Z]{2,})+$', line):
-                    resume_data["name"] = line.title()  # Convert to title case
-                    break
+                    return line.title()  # Convert to title case
                 # Fallback for other name formats
                 elif re.match(r'^[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+$', line):
-                    resume_data["name"] = line
-                    break
-        
-        # Extract email
-        email_match = re.search(self.patterns["email"], text)
-        if email_match:
-            email = email_match.group()
-            try:
-                # Validate email
-                validate_email(email)
-                resume_data["email"] = email
-            except EmailNotValidError:
-                pass
-        
-        # Extract phone
-        phone_match = re.search(self.patterns["phone"], text)
-        if phone_match:
-            phone = phone_match.group()
-            # Clean up phone number
-            phone = re.sub(r'[^0-9+]', '', phone)  # Remove non-digit and non-plus characters
-            if len(phone) >= 10:  # Ensure we have at least 10 digits
-                resume_data["phone"] = phone
-        
-        # Extract LinkedIn
+                    return line
+        return None
+    
+    def _extract_email(self, text: str) -> Optional[str]:
+        """Extract the first email address that passes the offline syntax check"""
+        for email_match in re.finditer(self.patterns["email"], text):
+            email = self.contact_normalizer.normalize_email(email_match.group())
+            if email:
+                return email
+        return None
+    
+    def _extract_phone(self, text: str) -> Optional[str]:
+        """Extract the first phone number, normalized to E.164"""
+        phones = self.contact_normalizer.find_phones(text)
+        return phones[0] if phones else None
+    
+    def _extract_linkedin(self, text: str) -> Optional[str]:
         linkedin_match = re.search(self.patterns["linkedin"], text)
-        if linkedin_match:
-            resume_data["linkedin"] = linkedin_match.group()
-        
-        # Extract GitHub
+        return linkedin_match.group() if linkedin_match else None
+    
+    def _extract_github(self, text: str) -> Optional[str]:
         github_match = re.search(self.patterns["github"], text)
-        if github_match:
-            resume_data["github"] = github_match.group()
-        
-        # Split text into sections
-        sections = self._split_into_sections(text)
-        
-        # Extract education
-        education_section = self._find_section(sections, self.patterns["education_keywords"])
-        if education_section:
-            resume_data["education"] = self._extract_education(education_section)
-        
-        # Extract experience
-        experience_section = self._find_section(sections, self.patterns["experience_keywords"])
-        if experience_section:
-            resume_data["experience"] = self._extract_experience(experience_section)
-        
-        # Extract skills
-        skills_section = self._find_section(sections, self.patterns["skills_keywords"])
-        if skills_section:
-            resume_data["skills"] = self._extract_skills(skills_section)
-        else:
-            # Try to extract skills from the entire text if no dedicated section
-            resume_data["skills"] = self._extract_skills(text)
-        
-        # Extract projects
-        projects_section = self._find_section(sections, self.patterns["projects_keywords"])
-        if projects_section:
-            resume_data["projects"] = self._extract_projects(projects_section)
-        
-        # Extract achievements
-        achievements_section = self._find_section(sections, self.patterns["achievements_keywords"])
-        if achievements_section:
-            resume_data["achievements"] = self._extract_achievements(achievements_section)
-        
-        # Generate interview topics based on skills
-        resume_data["interview_topics"] = self._generate_interview_topics(resume_data["skills"])
-        
-        return resume_data
+        return github_match.group() if github_match else None
+    
+    def _section_sources(self, text: str, sections: Dict[str, str]) -> Dict[str, Optional[str]]:
+        """Text each section-based field is extracted from (None if its section is missing)"""
+        return {
+            "education": self._find_section(sections, self.patterns["education_keywords"]),
+            "experience": self._find_section(sections, self.patterns["experience_keywords"]),
+            # Fall back to the entire text for skills if there is no dedicated section
+            "skills": self._find_section(sections, self.patterns["skills_keywords"]) or text,
+            "projects": self._find_section(sections, self.patterns["projects_keywords"]),
+            "achievements": self._find_section(sections, self.patterns["achievements_keywords"]),
+        }
     
     def _split_into_sections(self, text: str) -> Dict[str, str]:
         """Split resume text into different sections based on headers"""
@@ -278,8 +506,13 @@ class PDFExtractor:
             
             # Extract company name - look for names that are likely companies
             company_match = re.search(r'([A-Z][A-Za-z0-9\s&,.]+(?:Inc|LLC|Ltd|Corp|Corporation|Company|Technologies|Solutions|Systems|Group|Associates))', entry)
+            organisations = []
+            if not company_match and self.ner is not None:
+                organisations = self.ner.entities(self._experience_candidate_lines(entry), "ORG")
             if company_match:
                 exp.company = company_match.group(1).strip()
+            elif organisations:
+                exp.company = organisations[0]
             else:
                 # Fallback: look for words in all caps or title case at the beginning of entry
                 company_match = re.search(r'^([A-Z][A-Za-z0-9\s&,.]+)', entry)
@@ -0,0 +1,126 @@
+import io
+import re
+from typing import Any, Dict, Optional
+
+import PyPDF2
+
+from app import config
+from app.metrics import SharedCounters
+from app.models.resume_model import Triage
+
+# The header may be preceded by some junk (the spec allows up to 1024 bytes)
+_HEADER_WINDOW = 1024
+# %%EOF must be near the end; some writers append a little trailing data
+_TRAILER_WINDOW = 2048
+_ENCRYPT = re.compile(rb"/Encrypt\s*(?:\d+\s+\d+\s+R|<<)")
+
+
+class PDFTriage:
+    """
+    Cheap checks on an upload before any full parse: magic bytes, trailer,
+    size, encryption, page count and whether the pages have a text layer.
+
+    Only the cross-reference table and the page dictionaries are read (no
+    content stream is decoded). The outcome decides whether the file is
+    extracted locally, sent straight to Gemini direct (scanned, image-only
+    PDFs) or rejected.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = config.TRIAGE_MAX_BYTES,
+        max_pages: int = config.TRIAGE_MAX_PAGES,
+        text_layer_pages: int = 3,
+    ):
+        self.max_bytes = max_bytes
+        self.max_pages = max_pages
+        self.text_layer_pages = text_layer_pages
+        self.counters = SharedCounters(["extract", "gemini_direct", "reject"])
+
+    def check_size(self, size: Optional[int]) -> Optional[Triage]:
+        """Rejection for an upload that is too large, if its size is known before reading it"""
+        if size is not None and self.max_bytes and size > self.max_bytes:
+            return self._decide(Triage(
+                decision="reject", size_bytes=size,
+                reason=f"File is too large ({size} bytes, the limit is {self.max_bytes}).",
+            ))
+        return None
+
+    def inspect(self, content: bytes) -> Triage:
+        triage = self.check_size(len(content))
+        if triage is not None:
+            return triage
+        return self._decide(self._inspect(content))
+
+    def _inspect(self, content: bytes) -> Triage:
+        size = len(content)
+        if b"%PDF-" not in content[:_HEADER_WINDOW]:
+            return Triage(decision="reject", size_bytes=size, reason="Not a PDF file (no %PDF- header).")
+        tail = content[-_TRAILER_WINDOW:]
+        if b"%%EOF" not in tail or b"startxref" not in tail:
+            return Triage(decision="reject", size_bytes=size, reason="Truncated or corrupt PDF (no trailer).")
+        encrypted = _ENCRYPT.search(content) is not None
+
+        try:
+            reader = PyPDF2.PdfReader(io.BytesIO(content))
+            # PDFs with only an owner password open with an empty user password
+            if encrypted and reader.decrypt("") == PyPDF2.PasswordType.NOT_DECRYPTED:
+                return Triage(
+                    decision="reject", size_bytes=size, encrypted=True,
+                    reason="Password-protected PDFs are not supported.",
+                )
+            page_count = len(reader.pages)
+        except Exception as e:
+            return Triage(decision="reject", size_bytes=size, encrypted=encrypted, reason=f"Corrupt PDF: {e}")
+        if page_count == 0:
+            return Triage(
+                decision="reject", size_bytes=size, page_count=0, encrypted=encrypted,
+                reason="The PDF has no pages.",
+            )
+        if self.max_pages and page_count > self.max_pages:
+            return Triage(
+                decision="reject", size_bytes=size, page_count=page_count, encrypted=encrypted,
+                reason=f"Too many pages ({page_count}, the limit is {self.max_pages}).",
+            )
+
+        pages = [reader.pages[i] for i in range(min(page_count, self.text_layer_pages))]
+        if not any(self._has_fonts(page.get("/Resources")) for page in pages):
+            return Triage(
+                decision="gemini_direct", size_bytes=size, page_count=page_count, encrypted=encrypted,
+                has_text_layer=False,
+                reason="No text layer (scanned or image-only PDF).",
+            )
+        return Triage(
+            decision="extract", size_bytes=size, page_count=page_count, encrypted=encrypted,
+            has_text_layer=True,
+            reason="PDF with a text layer.",
+        )
+
+    def _has_fonts(self, resources, depth: int = 0) -> bool:
+        """Whether a resource dictionary (or a form XObject in it) declares fonts, i.e. can draw text"""
+        resources = _resolve(resources)
+        if not isinstance(resources, dict):
+            return False
+        if _resolve(resources.get("/Font")):
+            return True
+        if depth >= 2:
+            return False
+        xobjects = _resolve(resources.get("/XObject"))
+        if isinstance(xobjects, dict):
+            for xobject in xobjects.values():
+                xobject = _resolve(xobject)
+                if hasattr(xobject, "get") and xobject.get("/Subtype") == "/Form":
+                    if self._has_fonts(xobject.get("/Resources"), depth + 1):
+                        return True
+        return False
+
+    def _decide(self, triage: Triage) -> Triage:
+        self.counters.incr(triage.decision)
+        return triage
+
+    def stats(self) -> Dict[str, Any]:
+        return self.counters.snapshot()
+
+
+def _resolve(value):
+    return value.get_object() if hasattr(value, "get_object") else value
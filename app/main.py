@@ -1,9 +1,30 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.responses import JSONResponse
 
-from app.routers.resume_router import router as resume_router
+from app.metrics import counters
+from app.routers.resume_router import (
+    router as resume_router,
+    admission_controllers,
+    gemini_resume_service,
+    gemini_direct_service,
+    matching_service,
+    pdf_triage,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build (or, in a forked worker, catch up) the matching index in a thread,
+    # so that neither startup nor the first /match request blocks the event loop
+    warmup = asyncio.create_task(asyncio.to_thread(matching_service.warm))
+    yield
+    warmup.cancel()
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -13,6 +34,7 @@ app = FastAPI(
     docs_url=None,  # Disable default docs
     redoc_url=None,  # Disable default redoc
     openapi_url=None,  # Important: Disable default OpenAPI schema
+    lifespan=lifespan,
 )
 
 # Setup CORS middleware
@@ -28,6 +50,20 @@ app.add_middleware(
 app.include_router(resume_router)
 
 
+# Count requests in the shared counters (aggregated across all workers)
+@app.middleware("http")
+async def count_requests(request, call_next):
+    counters.incr("requests_total")
+    try:
+        response = await call_next(request)
+    except Exception:
+        counters.incr("requests_failed")
+        raise
+    if response.status_code >= 500:
+        counters.incr("requests_failed")
+    return response
+
+
 # Custom OpenAPI and Swagger UI
 @app.get("/docs", include_in_schema=False)
 async def custom_swagger_ui_html():
@@ -65,6 +101,18 @@ async def root():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    data = counters.snapshot()
+    data["admission"] = {name: controller.stats() for name, controller in admission_controllers.items()}
+    data["triage"] = pdf_triage.stats()
+    data["gemini"] = {
+        "gemini_extract": gemini_resume_service.gemini_client.stats(),
+        "gemini_direct": gemini_direct_service.gemini_client.stats(),
+    }
+    return data
+
+
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=False)
\ No newline at end of file
+    from app.server import run
+    run()
\ No newline at end of file
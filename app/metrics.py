@@ -0,0 +1,39 @@
+import multiprocessing
+from typing import Dict, List
+
+
+class SharedCounters:
+    """
+    Named integer counters kept in a shared-memory segment.
+
+    The segment is allocated when the object is created, so a counters object
+    created in the parent before forking is shared by every worker process.
+    In single-process mode it simply behaves like a dict of ints.
+    """
+
+    def __init__(self, names: List[str]):
+        self.names = list(names)
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self._values = multiprocessing.RawArray("q", len(self.names))
+        self._lock = multiprocessing.Lock()
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        index = self._index[name]
+        with self._lock:
+            self._values[index] += amount
+
+    def get(self, name: str) -> int:
+        return self._values[self._index[name]]
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {name: self._values[i] for i, name in enumerate(self.names)}
+
+
+# Process-wide counters, created at import time so that the pre-fork server
+# allocates them in the parent before any worker is started.
+counters = SharedCounters([
+    "requests_total",
+    "requests_failed",
+    "worker_restarts",
+])
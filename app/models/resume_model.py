@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import List, Optional
+from typing import Any, Dict, List, Literal, Optional, Union
 
 
 class Education(BaseModel):
@@ -27,7 +27,7 @@ class Project(BaseModel):
 
 class Resume(BaseModel):
     name: str = Field(default="Not Present")
-    email: EmailStr = Field(default="Not Present")
+    email: Union[EmailStr, Literal["Not Present"]] = Field(default="Not Present")
     phone: str = Field(default="Not Present")
     linkedin: str = Field(default="Not Present")
     github: str = Field(default="Not Present")
@@ -39,7 +39,50 @@ class Resume(BaseModel):
     interview_topics: List[str] = Field(default_factory=list)
 
 
+class ExtractionSnapshot(BaseModel):
+    """State kept per candidate so that a revised resume can be re-extracted incrementally"""
+    page_fingerprints: List[str] = Field(default_factory=list)
+    page_texts: List[str] = Field(default_factory=list)
+    section_fingerprints: Dict[str, str] = Field(default_factory=dict)
+    resume: Resume = Field(default_factory=Resume)
+    refined: Optional[Resume] = None
+
+
+class Triage(BaseModel):
+    """Outcome of the pre-parse checks on an uploaded file"""
+    decision: Literal["extract", "gemini_direct", "reject"]
+    reason: str
+    size_bytes: int
+    page_count: Optional[int] = None
+    encrypted: bool = False
+    has_text_layer: Optional[bool] = None
+
+
+class MatchRequest(BaseModel):
+    job_description: str
+    top_k: int = Field(default=10, ge=1, le=1000)
+
+
+class CandidateMatch(BaseModel):
+    candidate_id: str
+    score: float
+    matched_skills: List[str] = Field(default_factory=list)
+    matched_topics: List[str] = Field(default_factory=list)
+
+
+class MatchResponse(BaseModel):
+    success: bool
+    message: str
+    skills: List[str] = Field(default_factory=list)
+    matches: List[CandidateMatch] = Field(default_factory=list)
+
+
 class ResumeResponse(BaseModel):
     success: bool
     message: str
-    data: Optional[Resume] = None
\ No newline at end of file
+    data: Optional[Resume] = None
+    recomputed_sections: Optional[List[str]] = None
+    triage: Optional[Triage] = None
+    # True when Gemini ran out of the latency budget and the local extraction was returned
+    degraded: bool = False
+    profile: Optional[Dict[str, Any]] = None
\ No newline at end of file
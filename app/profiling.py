@@ -0,0 +1,169 @@
+import cProfile
+import hmac
+import os
+import pstats
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request
+
+from app import config
+
+# Only one request can be profiled at a time per worker, since cProfile
+# profiles the whole thread.
+_active: Optional["RequestProfiler"] = None
+_current: ContextVar[Optional["RequestProfiler"]] = ContextVar("request_profiler", default=None)
+
+FuncKey = Tuple[str, int, str]
+
+
+class RequestProfiler:
+    """
+    Deterministic profile of a single extraction.
+
+    CPU work runs under cProfile; time spent waiting on Gemini is measured
+    separately (with the profiler paused) so it doesn't blur the call tree.
+    """
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.waits: Dict[str, float] = {}
+        self.wait_depth = 0
+        self.wall_time = 0.0
+
+    @contextmanager
+    def activate(self):
+        token = _current.set(self)
+        start = time.perf_counter()
+        self.profile.enable()
+        try:
+            yield self
+        finally:
+            self.profile.disable()
+            self.wall_time += time.perf_counter() - start
+            _current.reset(token)
+
+    def summary(self, top: int = 15) -> Dict[str, Any]:
+        stats = pstats.Stats(self.profile).stats
+        by_cumulative = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+        summary = {
+            "wall_ms": round(self.wall_time * 1000, 2),
+            "cpu_ms": round(sum(value[2] for value in stats.values()) * 1000, 2),
+            "waits_ms": {name: round(seconds * 1000, 2) for name, seconds in self.waits.items()},
+            "top_functions": [_describe(key, value) for key, value in by_cumulative[:top]],
+            "extractor_functions": [
+                _describe(key, value) for key, value in by_cumulative
+                if key[0].endswith("pdf_extractor.py")
+            ][:top],
+            "call_tree": _call_tree(stats),
+        }
+        if config.PROFILE_DIR:
+            os.makedirs(config.PROFILE_DIR, exist_ok=True)
+            path = os.path.join(config.PROFILE_DIR, f"{uuid.uuid4().hex}.prof")
+            self.profile.dump_stats(path)
+            summary["artifact"] = path
+        return summary
+
+
+def _describe(key: FuncKey, value) -> Dict[str, Any]:
+    _, calls, own, cumulative, _ = value
+    return {
+        "function": _name(key),
+        "calls": calls,
+        "own_ms": round(own * 1000, 3),
+        "cumulative_ms": round(cumulative * 1000, 3),
+    }
+
+
+def _name(key: FuncKey) -> str:
+    filename, line, function = key
+    if filename == "~":
+        return function
+    return f"{os.path.basename(filename)}:{line}({function})"
+
+
+def _call_tree(stats, max_depth: int = 6, max_children: int = 5, min_fraction: float = 0.01) -> List[Dict[str, Any]]:
+    """Condensed call tree: the heaviest callees of each function, down to `max_depth`"""
+    children: Dict[FuncKey, List[Tuple[FuncKey, float]]] = {}
+    for callee, value in stats.items():
+        for caller, edge in value[4].items():
+            children.setdefault(caller, []).append((callee, edge[3]))
+    roots = [key for key, value in stats.items() if not value[4]]
+    total = sum(stats[key][3] for key in roots) or 1.0
+
+    def build(key: FuncKey, cumulative: float, depth: int, seen: frozenset) -> Dict[str, Any]:
+        node = {"function": _name(key), "cumulative_ms": round(cumulative * 1000, 3)}
+        if depth < max_depth:
+            heaviest = sorted(children.get(key, []), key=lambda child: child[1], reverse=True)
+            node["children"] = [
+                build(child, child_time, depth + 1, seen | {child})
+                for child, child_time in heaviest[:max_children]
+                if child_time / total >= min_fraction and child not in seen
+            ]
+        return node
+
+    roots.sort(key=lambda key: stats[key][3], reverse=True)
+    return [build(key, stats[key][3], 0, frozenset([key])) for key in roots[:max_children]]
+
+
+async def get_request_profiler(request: Request):
+    """
+    FastAPI dependency: yields a RequestProfiler when the request carries a
+    valid X-Profile-Token header and profiling is enabled, otherwise None.
+    Async so that it runs on the event loop: no threadpool hop per request,
+    and the check-and-set of the active profiler can't race.
+    """
+    global _active
+    token = request.headers.get("x-profile-token")
+    if token is None:
+        yield None
+        return
+    if not config.PROFILING_TOKEN or not hmac.compare_digest(token, config.PROFILING_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid profiling token.")
+    if _active is not None:
+        raise HTTPException(status_code=409, detail="Another profiled request is in progress.")
+    _active = RequestProfiler()
+    try:
+        yield _active
+    finally:
+        _active = None
+
+
+def activate(profiler: Optional[RequestProfiler]):
+    """Context manager that profiles the enclosed block if profiling was requested"""
+    if profiler is None:
+        return nullcontext()
+    return profiler.activate()
+
+
+def summary(profiler: Optional[RequestProfiler]) -> Optional[Dict[str, Any]]:
+    return profiler.summary() if profiler is not None else None
+
+
+@contextmanager
+def waiting(name: str):
+    """Mark time spent waiting on an external service (e.g. Gemini) in the current profile"""
+    profiler = _current.get()
+    if profiler is None:
+        yield
+        return
+    # Waits can overlap (e.g. hedged Gemini requests); only the outermost one
+    # pauses the profiler and is counted.
+    profiler.wait_depth += 1
+    if profiler.wait_depth > 1:
+        try:
+            yield
+        finally:
+            profiler.wait_depth -= 1
+        return
+    profiler.profile.disable()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.wait_depth -= 1
+        profiler.waits[name] = profiler.waits.get(name, 0.0) + time.perf_counter() - start
+        profiler.profile.enable()
@@ -1,12 +1,17 @@
-from fastapi import APIRouter, UploadFile, File, Depends, Form
+from fastapi import APIRouter, UploadFile, File, Depends, Form, Query, Request, Response
 from fastapi.responses import JSONResponse
-from typing import List
+from typing import List, Optional, Tuple
+import asyncio
 import os
 
+from app import budget, config, profiling
+from app.admission import AdmissionController
+from app.extractors.triage import PDFTriage
 from app.services.resume_service import ResumeService
-from app.models.resume_model import ResumeResponse, Resume
+from app.models.resume_model import MatchRequest, MatchResponse, ResumeResponse, Resume, Triage
 from app.services.gemini_resume_service import GeminiResumeService
 from app.services.gemini_direct_service import GeminiDirectService  # Import the new service
+from app.services.matching_service import MatchingService
 
 router = APIRouter(prefix="/api/v1/resume", tags=["Resume Extraction"])
 
@@ -14,6 +19,40 @@ router = APIRouter(prefix="/api/v1/resume", tags=["Resume Extraction"])
 resume_service = ResumeService()
 gemini_resume_service = GeminiResumeService()
 gemini_direct_service = GeminiDirectService()
+matching_service = MatchingService()
+pdf_triage = PDFTriage()
+
+# Per-endpoint admission control (concurrency and queue-depth limits)
+admission_controllers = {
+    name: AdmissionController(name, **limits)
+    for name, limits in config.ADMISSION_LIMITS.items()
+}
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Split the comma-separated `fields` query parameter (None means all fields)"""
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(",") if field.strip()]
+
+
+async def triage_upload(file: UploadFile) -> Tuple[Optional[bytes], Triage]:
+    """Read an upload and run the pre-parse checks (oversized uploads are rejected unread)"""
+    triage = pdf_triage.check_size(getattr(file, "size", None))
+    if triage is not None:
+        return None, triage
+    content = await file.read()
+    return content, pdf_triage.inspect(content)
+
+
+def degraded(latency_budget: Optional[budget.LatencyBudget]) -> bool:
+    return latency_budget is not None and latency_budget.degraded
+
+
+def success_message(message: str, latency_budget: Optional[budget.LatencyBudget]) -> str:
+    if degraded(latency_budget):
+        return latency_budget.degraded_reason
+    return message
 
 
 def get_resume_service() -> ResumeService:
@@ -28,152 +67,312 @@ def get_gemini_direct_service() -> GeminiDirectService:
     return gemini_direct_service
 
 
+def get_matching_service() -> MatchingService:
+    return matching_service
+
+
 @router.post("/extract", response_model=ResumeResponse, summary="Extract data from resume (standard)")
 async def extract_resume(
+    request: Request,
+    response: Response,
     file: UploadFile = File(...),
-    service: ResumeService = Depends(get_resume_service)
+    candidate_id: Optional[str] = Form(None),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to extract (default: all)"),
+    service: ResumeService = Depends(get_resume_service),
+    profiler: Optional[profiling.RequestProfiler] = Depends(profiling.get_request_profiler),
+    latency_budget: Optional[budget.LatencyBudget] = Depends(budget.get_latency_budget)
 ):
     """
     Extract structured data from a resume file (PDF) using the standard extraction method.
 
     - **file**: Resume file (currently only PDF format is supported).
+    - **candidate_id**: Optional candidate identifier. When given, the extraction is stored and a
+      re-upload for the same candidate only re-extracts the sections that changed; these are
+      listed in `recomputed_sections`.
+    - **fields**: Optional comma-separated list of fields to extract (e.g. `email,phone,skills`).
+      Only these fields and the fields they depend on are computed; the others keep their defaults.
 
     Returns a structured JSON with all extracted fields.
+    The upload is triaged before parsing (see `triage` in the response): files that are not
+    PDFs, truncated, password-protected or too large are rejected, and scanned PDFs without a text
+    layer are extracted by Gemini directly.
+    Responds with 503 and a Retry-After header when the endpoint is overloaded.
+    Clients can send an X-Request-Timeout header (seconds) so that the request is
+    dropped instead of processed once they have stopped waiting.
+    With a valid X-Profile-Token header the extraction is profiled and a profile
+    summary is returned in the `profile` field.
+    Gemini calls are bounded by the latency budget (X-Latency-Budget header, seconds);
+    when it runs out the local extraction is returned with `degraded` set.
     """
-    try:
-        # Check file extension
-        file_extension = os.path.splitext(file.filename)[1][1:].lower()
-        if file_extension != "pdf":
+    async with admission_controllers["extract"].admit(request, response):
+        try:
+            # Check file extension
+            file_extension = os.path.splitext(file.filename)[1][1:].lower()
+            if file_extension != "pdf":
+                return ResumeResponse(
+                    success=False,
+                    message=f"Unsupported file format: {file_extension}. Only PDF is currently supported.",
+                    data=None
+                )
+
+            # Read the file and check it before any full parse
+            file_content, triage = await triage_upload(file)
+            if triage.decision == "reject":
+                return ResumeResponse(success=False, message=triage.reason, data=None, triage=triage)
+            field_list = parse_fields(fields)
+
+            # Extract data
+            recomputed_sections = None
+            with profiling.activate(profiler), budget.activate(latency_budget):
+                if triage.decision == "gemini_direct":
+                    # Scanned PDF: there is no text layer to extract locally, so Gemini reads the pages
+                    resume_data = await gemini_direct_service.extract_data_from_pdf(file_content, field_list)
+                elif candidate_id:
+                    if field_list is not None:
+                        raise ValueError("fields cannot be combined with candidate_id.")
+                    resume_data, recomputed_sections = await service.extract_resume_data_incremental(
+                        file_content, file_extension, candidate_id
+                    )
+                else:
+                    resume_data = await service.extract_resume_data(file_content, file_extension, field_list)
+
+            # Validate extraction success
+            if not service.validate_extraction(resume_data, field_list):
+                return ResumeResponse(
+                    success=False,
+                    message="Unable to extract sufficient data from the resume. Please check file quality and format.",
+                    data=resume_data,
+                    recomputed_sections=recomputed_sections,
+                    triage=triage,
+                    degraded=degraded(latency_budget),
+                    profile=profiling.summary(profiler)
+                )
+
+            return ResumeResponse(
+                success=True,
+                message=success_message("Resume data extracted successfully", latency_budget),
+                data=resume_data,
+                recomputed_sections=recomputed_sections,
+                triage=triage,
+                degraded=degraded(latency_budget),
+                profile=profiling.summary(profiler)
+            )
+
+        except ValueError as e:
             return ResumeResponse(
                 success=False,
-                message=f"Unsupported file format: {file_extension}. Only PDF is currently supported.",
+                message=str(e),
                 data=None
             )
-
-        # Read file content
-        file_content = await file.read()
-
-        # Extract data
-        resume_data = await service.extract_resume_data(file_content, file_extension)
-
-        # Validate extraction success
-        if not service.validate_extraction(resume_data):
+        except Exception as e:
             return ResumeResponse(
                 success=False,
-                message="Unable to extract sufficient data from the resume. Please check file quality and format.",
-                data=resume_data
+                message=f"An error occurred during extraction: {str(e)}",
+                data=None
             )
 
-        return ResumeResponse(
-            success=True,
-            message="Resume data extracted successfully",
-            data=resume_data
-        )
-
-    except ValueError as e:
-        return ResumeResponse(
-            success=False,
-            message=str(e),
-            data=None
-        )
-    except Exception as e:
-        return ResumeResponse(
-            success=False,
-            message=f"An error occurred during extraction: {str(e)}",
-            data=None
-        )
-
 
 @router.post("/gemini-extract", response_model=ResumeResponse, summary="Extract resume data using Gemini (enhanced)")
 async def extract_resume_with_gemini(
+    request: Request,
+    response: Response,
     file: UploadFile = File(...),
-    service: GeminiResumeService = Depends(get_gemini_resume_service)
+    candidate_id: Optional[str] = Form(None),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to extract (default: all)"),
+    service: GeminiResumeService = Depends(get_gemini_resume_service),
+    profiler: Optional[profiling.RequestProfiler] = Depends(profiling.get_request_profiler),
+    latency_budget: Optional[budget.LatencyBudget] = Depends(budget.get_latency_budget)
 ):
     """
     Extract structured data from a resume file (PDF) using Gemini for enhanced extraction.
 
     - **file**: Resume file (currently only PDF format is supported).
+    - **candidate_id**: Optional candidate identifier. When given, a re-upload for the same
+      candidate skips Gemini if nothing changed and only updates the sections that changed;
+      these are listed in `recomputed_sections`.
+    - **fields**: Optional comma-separated list of fields to extract (e.g. `email,phone,skills`).
+      Only these fields and the fields they depend on are computed; the others keep their defaults.
 
     Returns a structured JSON with all extracted fields, potentially enhanced by Gemini.
+    The upload is triaged before parsing (see `triage` in the response): files that are not
+    PDFs, truncated, password-protected or too large are rejected, and scanned PDFs without a text
+    layer are extracted by Gemini directly.
+    Responds with 503 and a Retry-After header when the endpoint is overloaded.
+    Clients can send an X-Request-Timeout header (seconds) so that the request is
+    dropped instead of processed once they have stopped waiting.
+    With a valid X-Profile-Token header the extraction is profiled and a profile
+    summary is returned in the `profile` field.
+    Gemini calls are bounded by the latency budget (X-Latency-Budget header, seconds);
+    when it runs out the local extraction is returned with `degraded` set.
     """
-    try:
-        # Check file extension
-        file_extension = os.path.splitext(file.filename)[1][1:].lower()
-        if file_extension != "pdf":
+    async with admission_controllers["gemini_extract"].admit(request, response):
+        try:
+            # Check file extension
+            file_extension = os.path.splitext(file.filename)[1][1:].lower()
+            if file_extension != "pdf":
+                return ResumeResponse(
+                    success=False,
+                    message=f"Unsupported file format: {file_extension}. Only PDF is currently supported.",
+                    data=None
+                )
+
+            # Read the file and check it before any full parse
+            file_content, triage = await triage_upload(file)
+            if triage.decision == "reject":
+                return ResumeResponse(success=False, message=triage.reason, data=None, triage=triage)
+            field_list = parse_fields(fields)
+
+            # Extract data using the Gemini-enhanced service
+            recomputed_sections = None
+            with profiling.activate(profiler), budget.activate(latency_budget):
+                if triage.decision == "gemini_direct":
+                    # Scanned PDF: there is no text layer to extract locally, so Gemini reads the pages
+                    resume_data = await gemini_direct_service.extract_data_from_pdf(file_content, field_list)
+                elif candidate_id:
+                    if field_list is not None:
+                        raise ValueError("fields cannot be combined with candidate_id.")
+                    resume_data, recomputed_sections = await service.extract_resume_data_incremental(
+                        file_content, file_extension, candidate_id
+                    )
+                else:
+                    resume_data = await service.extract_resume_data(file_content, file_extension, field_list)
+
+            # Validate extraction success (you might want to adjust this based on Gemini's output)
+            if not service.validate_extraction(resume_data, field_list):
+                return ResumeResponse(
+                    success=False,
+                    message="Unable to extract sufficient data from the resume using Gemini. Please check file quality and format.",
+                    data=resume_data,
+                    recomputed_sections=recomputed_sections,
+                    triage=triage,
+                    degraded=degraded(latency_budget),
+                    profile=profiling.summary(profiler)
+                )
+
+            return ResumeResponse(
+                success=True,
+                message=success_message("Resume data extracted successfully using Gemini", latency_budget),
+                data=resume_data,
+                recomputed_sections=recomputed_sections,
+                triage=triage,
+                degraded=degraded(latency_budget),
+                profile=profiling.summary(profiler)
+            )
+
+        except ValueError as e:
             return ResumeResponse(
                 success=False,
-                message=f"Unsupported file format: {file_extension}. Only PDF is currently supported.",
+                message=str(e),
                 data=None
             )
-
-        # Read file content
-        file_content = await file.read()
-
-        # Extract data using the Gemini-enhanced service
-        resume_data = await service.extract_resume_data(file_content, file_extension)
-
-        # Validate extraction success (you might want to adjust this based on Gemini's output)
-        if not service.validate_extraction(resume_data):
+        except Exception as e:
             return ResumeResponse(
                 success=False,
-                message="Unable to extract sufficient data from the resume using Gemini. Please check file quality and format.",
-                data=resume_data
+                message=f"An error occurred during Gemini-enhanced extraction: {str(e)}",
+                data=None
             )
 
-        return ResumeResponse(
-            success=True,
-            message="Resume data extracted successfully using Gemini",
-            data=resume_data
-        )
-
-    except ValueError as e:
-        return ResumeResponse(
-            success=False,
-            message=str(e),
-            data=None
-        )
-    except Exception as e:
-        return ResumeResponse(
-            success=False,
-            message=f"An error occurred during Gemini-enhanced extraction: {str(e)}",
-            data=None
-        )
-
 @router.post(
     "/extract-gemini-direct",
     response_model=ResumeResponse,
     summary="Extract resume data from a PDF file using Gemini (direct)"
 )
 async def extract_resume_gemini_direct(
+    request: Request,
+    response: Response,
     file: UploadFile = File(...),
-    service: GeminiDirectService = Depends(get_gemini_direct_service)
+    fields: Optional[str] = Query(None, description="Comma-separated fields to extract (default: all)"),
+    service: GeminiDirectService = Depends(get_gemini_direct_service),
+    profiler: Optional[profiling.RequestProfiler] = Depends(profiling.get_request_profiler),
+    latency_budget: Optional[budget.LatencyBudget] = Depends(budget.get_latency_budget)
 ):
     """
     Upload a PDF file and extract structured resume data using Gemini directly.
 
     - **file**: The uploaded resume file in PDF format.
+    - **fields**: Optional comma-separated list of fields to extract (e.g. `email,phone,skills`).
+      Only these fields and the fields they depend on are computed; the others keep their defaults.
 
     Returns a structured JSON with all extracted fields, extracted directly by Gemini.
+    Files that are not PDFs, truncated, password-protected or too large are rejected before
+    being sent to Gemini (see `triage` in the response).
+    Responds with 503 and a Retry-After header when the endpoint is overloaded.
+    Clients can send an X-Request-Timeout header (seconds) so that the request is
+    dropped instead of processed once they have stopped waiting.
+    With a valid X-Profile-Token header the extraction is profiled and a profile
+    summary is returned in the `profile` field.
+    Gemini calls are bounded by the latency budget (X-Latency-Budget header, seconds);
+    when it runs out the local extraction is returned with `degraded` set.
     """
-    try:
-        resume_data = await service.extract_data_from_pdf_file(file)
-        return ResumeResponse(
-            success=True,
-            message="Resume data extracted successfully from file using Gemini (direct)",
-            data=resume_data
-        )
-    except ValueError as e:
-        return ResumeResponse(
-            success=False,
-            message=str(e),
-            data=None
-        )
-    except Exception as e:
-        return ResumeResponse(
-            success=False,
-            message=f"An unexpected error occurred during Gemini direct extraction: {str(e)}",
-            data=None
-        )
+    async with admission_controllers["gemini_direct"].admit(request, response):
+        try:
+            file_content, triage = await triage_upload(file)
+            if triage.decision == "reject":
+                return ResumeResponse(success=False, message=triage.reason, data=None, triage=triage)
+            with profiling.activate(profiler), budget.activate(latency_budget):
+                resume_data = await service.extract_data_from_pdf(file_content, parse_fields(fields))
+            return ResumeResponse(
+                success=True,
+                message=success_message("Resume data extracted successfully from file using Gemini (direct)", latency_budget),
+                data=resume_data,
+                triage=triage,
+                degraded=degraded(latency_budget),
+                profile=profiling.summary(profiler)
+            )
+        except ValueError as e:
+            return ResumeResponse(
+                success=False,
+                message=str(e),
+                data=None
+            )
+        except Exception as e:
+            return ResumeResponse(
+                success=False,
+                message=f"An unexpected error occurred during Gemini direct extraction: {str(e)}",
+                data=None
+            )
+
+
+@router.post("/match", response_model=MatchResponse, summary="Rank stored candidates against a job description")
+async def match_candidates(
+    request: Request,
+    response: Response,
+    match_request: MatchRequest,
+    service: MatchingService = Depends(get_matching_service)
+):
+    """
+    Find the candidates whose skills best match a job description.
+
+    - **job_description**: Text of the job description; skills are found in it with the same
+      matcher as in resumes.
+    - **top_k**: Number of candidates to return (default 10).
+
+    Candidates are the resumes extracted with a `candidate_id`, ranked by IDF-weighted cosine
+    similarity of their skills and interview topics. Returns the skills found in the job
+    description and the best matches with the skills and topics they share with it.
+    Responds with 503 and a Retry-After header when the endpoint is overloaded.
+    """
+    async with admission_controllers["match"].admit(request, response):
+        try:
+            skills, matches = await asyncio.to_thread(
+                service.match, match_request.job_description, match_request.top_k
+            )
+            if not skills:
+                return MatchResponse(
+                    success=False,
+                    message="No known skills found in the job description."
+                )
+            return MatchResponse(
+                success=True,
+                message=f"Found {len(matches)} matching candidates",
+                skills=skills,
+                matches=matches
+            )
+        except Exception as e:
+            return MatchResponse(
+                success=False,
+                message=f"An error occurred during matching: {str(e)}"
+            )
 
 
 @router.get("/supported-formats", response_model=List[str])
@@ -0,0 +1,212 @@
+import gc
+import os
+import random
+import signal
+import socket
+import sys
+import time
+from typing import Dict, List, Optional
+
+import uvicorn
+
+from app import config
+
+
+def available_cpus() -> List[int]:
+    """CPUs this process is allowed to run on (respects taskset/cgroup limits)"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+class PreforkServer:
+    """
+    Multi-worker server that loads the application once in the parent and then
+    forks the workers, so the imported modules, service singletons and the
+    extractor taxonomy are shared copy-on-write instead of being rebuilt by
+    every worker.
+
+    Workers exit on their own after serving `max_requests` requests (plus a
+    random jitter) and are replaced by the parent, which bounds memory growth.
+    A worker that dies right after starting is replaced with an exponential
+    backoff, and the parent gives up after `max_failed_starts` in a row.
+    """
+
+    def __init__(
+        self,
+        host: str = config.HOST,
+        port: int = config.PORT,
+        workers: int = config.WORKERS,
+        max_requests: int = config.MAX_REQUESTS_PER_WORKER,
+        max_requests_jitter: int = config.MAX_REQUESTS_JITTER,
+        cpu_affinity: bool = config.CPU_AFFINITY,
+        min_uptime: float = config.WORKER_MIN_UPTIME,
+        max_backoff: float = config.WORKER_MAX_BACKOFF,
+        max_failed_starts: int = config.WORKER_MAX_FAILED_STARTS,
+    ):
+        self.host = host
+        self.port = port
+        self.cpus = available_cpus()
+        self.workers = workers if workers > 0 else len(self.cpus)
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.cpu_affinity = cpu_affinity and hasattr(os, "sched_setaffinity")
+        self.app = None
+        self.sock: Optional[socket.socket] = None
+        self.min_uptime = min_uptime
+        self.max_backoff = max_backoff
+        self.max_failed_starts = max_failed_starts
+        self.children: Dict[int, int] = {}  # pid -> worker slot
+        self.started_at: Dict[int, float] = {}  # slot -> time its worker was forked
+        self.failed_starts: Dict[int, int] = {}  # slot -> failed starts in a row
+        self.respawn_at: Dict[int, float] = {}  # slot -> when to replace its dead worker
+        self.should_exit = False
+        self.exit_code = 0
+
+    def preload(self) -> None:
+        """Import the app and warm the extractor before any worker is forked"""
+        from app.main import app
+        from app.routers.resume_router import matching_service, resume_service
+
+        # Run the extractor once so the taxonomy, the compiled regexes in
+        # the `re` cache and the NER model (if enabled) already live in the
+        # parent's memory.
+        resume_service.pdf_extractor._process_text(
+            "John Doe\njohn.doe@example.com\n+1 555 555 5555\n\n"
+            "Skills\nPython, Java, SQL\n\nEducation\nState University\n\n"
+            "Experience\nAcme Technologies\nSoftware Engineer 2020 - Present\n\n"
+            "Projects\nDemo Project\n\nAchievements\n- Award\n"
+        )
+        # Build the candidate index once here; the workers inherit it and
+        # only catch up with candidates stored after the fork.
+        matching_service.warm()
+        self.app = app
+
+    def bind(self) -> None:
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((self.host, self.port))
+        self.sock.listen(2048)
+        self.sock.set_inheritable(True)
+
+    def run(self) -> None:
+        self.preload()
+        self.bind()
+
+        # Move everything allocated so far out of the GC's reach, so that
+        # collections in the workers don't touch (and copy) the shared pages.
+        gc.collect()
+        gc.freeze()
+
+        signal.signal(signal.SIGTERM, self._handle_exit)
+        signal.signal(signal.SIGINT, self._handle_exit)
+
+        print(f"Starting {self.workers} workers on http://{self.host}:{self.port}")
+        for slot in range(self.workers):
+            self._spawn_worker(slot)
+
+        try:
+            self._supervise()
+        finally:
+            self._stop_workers()
+            self.sock.close()
+        if self.exit_code:
+            sys.exit(self.exit_code)
+
+    def _supervise(self) -> None:
+        from app.metrics import counters
+
+        while not self.should_exit:
+            now = time.monotonic()
+            for slot, when in list(self.respawn_at.items()):
+                if when <= now:
+                    del self.respawn_at[slot]
+                    counters.incr("worker_restarts")
+                    self._spawn_worker(slot)
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                pid = 0
+            if pid == 0:
+                time.sleep(0.5)
+                continue
+            slot = self.children.pop(pid, None)
+            if slot is not None and not self.should_exit:
+                self._schedule_respawn(slot, status)
+
+    def _schedule_respawn(self, slot: int, status: int) -> None:
+        """
+        Replace a dead worker, after a delay if it failed right after starting.
+        Only a crash (non-zero exit or a signal) counts as a failed start; a
+        clean exit, e.g. after max_requests, is replaced right away.
+        """
+        clean_exit = os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+        if clean_exit or time.monotonic() - self.started_at[slot] >= self.min_uptime:
+            self.failed_starts[slot] = 0
+            self.respawn_at[slot] = 0.0
+            return
+        failures = self.failed_starts.get(slot, 0) + 1
+        self.failed_starts[slot] = failures
+        if self.max_failed_starts > 0 and failures >= self.max_failed_starts:
+            print(f"Worker {slot} failed to start {failures} times in a row, shutting down")
+            self.should_exit = True
+            self.exit_code = 1
+            return
+        delay = min(2.0 ** (failures - 1), self.max_backoff)
+        print(f"Worker {slot} crashed right after starting, restarting it in {delay:.0f}s")
+        self.respawn_at[slot] = time.monotonic() + delay
+
+    def _spawn_worker(self, slot: int) -> None:
+        pid = os.fork()
+        if pid:
+            self.children[pid] = slot
+            self.started_at[slot] = time.monotonic()
+            return
+
+        # Child process
+        exit_code = 0
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            random.seed()
+            if self.cpu_affinity:
+                os.sched_setaffinity(0, {self.cpus[slot % len(self.cpus)]})
+            self._serve()
+        except BaseException as e:
+            print(f"Worker {os.getpid()} crashed: {e}")
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def _serve(self) -> None:
+        limit = None
+        if self.max_requests > 0:
+            limit = self.max_requests
+            if self.max_requests_jitter > 0:
+                limit += random.randint(0, self.max_requests_jitter)
+        server = uvicorn.Server(uvicorn.Config(self.app, limit_max_requests=limit))
+        server.run(sockets=[self.sock])
+
+    def _stop_workers(self) -> None:
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self.children.pop(pid, None)
+        for pid in list(self.children):
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self.children.clear()
+
+    def _handle_exit(self, signum, frame) -> None:
+        self.should_exit = True
+
+
+def run(workers: int = config.WORKERS) -> None:
+    """Start the API, forking workers when more than one is configured"""
+    if workers == 1:
+        uvicorn.run("app.main:app", host=config.HOST, port=config.PORT, reload=False)
+    else:
+        PreforkServer(workers=workers).run()
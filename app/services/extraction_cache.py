@@ -0,0 +1,126 @@
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+
+from app import config
+from app.models.resume_model import ExtractionSnapshot
+
+
+class ExtractionCache:
+    """
+    Per-candidate extraction snapshots used for incremental re-extraction,
+    stored in SQLite so that all workers (and restarts) share them.
+
+    Snapshots are namespaced by service, since the Gemini service also keeps
+    the refined resume. Besides candidate ids, keys can be content hashes
+    (see content_key) for results that don't belong to a candidate.
+    """
+
+    def __init__(self, path: str = config.INCREMENTAL_DB_PATH):
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # Opened lazily, and again after a fork: SQLite connections must not
+        # be shared between processes.
+        if self._connection is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots ("
+                "namespace TEXT NOT NULL, candidate_id TEXT NOT NULL, data TEXT NOT NULL, "
+                "updated_at REAL NOT NULL, PRIMARY KEY (namespace, candidate_id))"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS snapshots_updated_at ON snapshots (updated_at)")
+            self._pid = os.getpid()
+        return self._connection
+
+    @staticmethod
+    def content_key(content: bytes, fields: Optional[Iterable[str]] = None) -> str:
+        """Key for the result of extracting `fields` (None for all) from a file"""
+        digest = hashlib.sha256(content).hexdigest()
+        return digest if fields is None else f"{digest}:{','.join(sorted(set(fields)))}"
+
+    def get(
+        self, namespace: str, candidate_id: str, max_age: Optional[float] = None
+    ) -> Optional[ExtractionSnapshot]:
+        """The stored snapshot, unless it is older than `max_age` seconds"""
+        oldest = time.time() - max_age if max_age else -math.inf
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT data FROM snapshots WHERE namespace = ? AND candidate_id = ? AND updated_at >= ?",
+                (namespace, candidate_id, oldest),
+            ).fetchone()
+        if row is None:
+            return None
+        return ExtractionSnapshot.model_validate_json(row[0])
+
+    def put(self, namespace: str, candidate_id: str, snapshot: ExtractionSnapshot) -> None:
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO snapshots (namespace, candidate_id, data, updated_at) VALUES (?, ?, ?, ?)",
+                (namespace, candidate_id, snapshot.model_dump_json(), time.time()),
+            )
+
+    def put_bounded(
+        self,
+        namespace: str,
+        candidate_id: str,
+        snapshot: ExtractionSnapshot,
+        max_age: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ) -> None:
+        """
+        put() for caches that must not grow without limit: afterwards, snapshots
+        of `namespace` older than `max_age` seconds are deleted, and the oldest
+        ones beyond `max_entries`.
+        """
+        self.put(namespace, candidate_id, snapshot)
+        with self._lock:
+            if max_age:
+                self.connection.execute(
+                    "DELETE FROM snapshots WHERE namespace = ? AND updated_at < ?",
+                    (namespace, time.time() - max_age),
+                )
+            if max_entries:
+                self.connection.execute(
+                    "DELETE FROM snapshots WHERE namespace = ? AND updated_at < ("
+                    "SELECT updated_at FROM snapshots WHERE namespace = ? "
+                    "ORDER BY updated_at DESC LIMIT 1 OFFSET ?)",
+                    (namespace, namespace, max_entries - 1),
+                )
+
+    def skills_since(self, namespaces: List[str], since: float) -> List[Tuple[str, float, str, str]]:
+        """
+        (candidate_id, updated_at, skills JSON, interview topics JSON) of the
+        snapshots in `namespaces` written after `since`, oldest first. Taken
+        from the refined resume when there is one; only these two values of
+        each snapshot are read.
+        """
+        placeholders = ", ".join("?" for _ in namespaces)
+        # "+namespace" keeps SQLite from scanning the whole namespace through the
+        # primary key instead of using the updated_at index
+        with self._lock:
+            return self.connection.execute(
+                "SELECT candidate_id, updated_at, "
+                "CASE WHEN json_type(data, '$.refined') = 'object' "
+                "THEN json_extract(data, '$.refined.skills') ELSE json_extract(data, '$.resume.skills') END, "
+                "CASE WHEN json_type(data, '$.refined') = 'object' "
+                "THEN json_extract(data, '$.refined.interview_topics') "
+                "ELSE json_extract(data, '$.resume.interview_topics') END "
+                f"FROM snapshots WHERE +namespace IN ({placeholders}) AND updated_at > ? ORDER BY updated_at",
+                (*namespaces, since),
+            ).fetchall()
+
+
+extraction_cache = ExtractionCache()
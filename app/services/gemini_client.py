@@ -0,0 +1,111 @@
+import asyncio
+import base64
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import google.generativeai as genai
+import httpx
+
+from app import config, profiling
+
+
+class GeminiClient:
+    """
+    Small wrapper around the Gemini API shared by the Gemini services.
+
+    By default requests go through the `google.generativeai` SDK. When a base
+    URL is configured (GEMINI_API_BASE_URL) the client talks to the Gemini
+    REST API at that address instead, which is how the services are pointed
+    at a local fake Gemini server for load tests.
+    """
+
+    def __init__(
+        self,
+        api_key: str = config.GEMINI_API_KEY,
+        model_name: str = config.GEMINI_MODEL,
+        base_url: str = config.GEMINI_API_BASE_URL,
+    ):
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY not provided.")
+        self.api_key = api_key
+        self.model_name = model_name
+        self.base_url = base_url.rstrip("/")
+        self._http: Optional[httpx.AsyncClient] = None
+        self._http_loop = None
+        self._model = None
+        if not self.base_url:
+            genai.configure(api_key=self.api_key)
+            self._model = genai.GenerativeModel(model_name=f"models/{self.model_name}")
+
+    async def generate_text(self, prompt: str, timeout: Optional[float] = None) -> str:
+        """Send a text-only prompt and return the response text (`timeout` in seconds)"""
+        with profiling.waiting("gemini"):
+            if self._model is not None:
+                response = await self._model.generate_content_async(
+                    prompt, request_options=self._request_options(timeout)
+                )
+                return response.text.strip()
+            return await self._generate_rest([{"text": prompt}], timeout)
+
+    async def generate_from_pdf(self, prompt: str, pdf_content: bytes, timeout: Optional[float] = None) -> str:
+        """Send a prompt together with a PDF document and return the response text (`timeout` in seconds)"""
+        with profiling.waiting("gemini"):
+            if self._model is not None:
+                started = time.monotonic()
+                uploaded_file = await asyncio.to_thread(self._upload_pdf, pdf_content)
+                if timeout is not None:
+                    timeout -= time.monotonic() - started
+                    if timeout <= 0:
+                        raise TimeoutError("Uploading the PDF to Gemini took the whole timeout.")
+                response = await self._model.generate_content_async(
+                    [prompt, uploaded_file], request_options=self._request_options(timeout)
+                )
+                return response.text.strip()
+            return await self._generate_rest([
+                {"text": prompt},
+                {"inline_data": {
+                    "mime_type": "application/pdf",
+                    "data": base64.b64encode(pdf_content).decode("ascii"),
+                }},
+            ], timeout)
+
+    @staticmethod
+    def _request_options(timeout: Optional[float]) -> Optional[Dict[str, Any]]:
+        return {"timeout": timeout} if timeout is not None else None
+
+    def _upload_pdf(self, pdf_content: bytes):
+        temp_file_path = ""
+        try:
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
+                temp_file.write(pdf_content)
+                temp_file_path = temp_file.name
+            return genai.upload_file(path=temp_file_path, mime_type="application/pdf")
+        finally:
+            if temp_file_path and os.path.exists(temp_file_path):
+                os.remove(temp_file_path)
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        # Connections belong to the event loop they were opened on
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._http_loop is not loop:
+            self._http = httpx.AsyncClient(base_url=self.base_url, timeout=None)
+            self._http_loop = loop
+        return self._http
+
+    async def _generate_rest(self, parts: List[Dict[str, Any]], timeout: Optional[float] = None) -> str:
+        response = await self.http.post(
+            f"/v1beta/models/{self.model_name}:generateContent",
+            params={"key": self.api_key},
+            json={"contents": [{"role": "user", "parts": parts}]},
+            timeout=timeout,
+        )
+        if response.status_code != 200:
+            raise ValueError(f"Gemini API returned HTTP {response.status_code}: {response.text[:200]}")
+        try:
+            candidate = response.json()["candidates"][0]
+            return "".join(part.get("text", "") for part in candidate["content"]["parts"]).strip()
+        except (KeyError, IndexError, ValueError) as e:
+            raise ValueError(f"Unexpected Gemini API response: {e}") from e
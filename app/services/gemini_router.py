@@ -0,0 +1,225 @@
+import asyncio
+import itertools
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app import budget, config, profiling
+from app.services.gemini_client import GeminiClient
+
+
+# A Gemini call on one client, given the timeout in seconds (None for no timeout)
+GeminiRequest = Callable[[GeminiClient, Optional[float]], Awaitable[str]]
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    # Attempts that fail after the call has already returned (a hedge that
+    # lost, or a client timeout racing the budget) are never awaited again;
+    # reading the exception keeps asyncio from logging it as never retrieved.
+    if not task.cancelled():
+        task.exception()
+
+
+class GeminiBackend:
+    """One key/model/endpoint combination with its rolling latency and error statistics"""
+
+    # Errors older than this no longer count, so a backend that was failing
+    # gets tried again once it has been left alone for a while
+    error_horizon = 60.0
+
+    def __init__(self, client: GeminiClient, window: int = 100, error_window: int = 50):
+        self.client = client
+        self.name = f"{client.model_name}@{client.base_url or 'sdk'}#{client.api_key[-4:]}"
+        self.latencies: deque = deque(maxlen=window)
+        self.outcomes: deque = deque(maxlen=error_window)
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.in_flight = 0
+
+    def error_rate(self, now: float) -> float:
+        recent = [ok for timestamp, ok in self.outcomes if now - timestamp <= self.error_horizon]
+        if not recent:
+            return 0.0
+        return recent.count(False) / len(recent)
+
+    def healthy(self, now: float, max_error_rate: float) -> bool:
+        return now >= self.cooldown_until and self.error_rate(now) <= max_error_rate
+
+    def latency_percentile(self, pct: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+    def record_success(self, latency: float) -> None:
+        self.latencies.append(latency)
+        self.outcomes.append((time.monotonic(), True))
+        self.consecutive_failures = 0
+
+    def record_failure(self, now: float) -> None:
+        self.outcomes.append((now, False))
+        self.consecutive_failures += 1
+        # Back off a failing backend for a while (1s, 2s, 4s, ... up to 30s)
+        self.cooldown_until = now + min(30.0, 2.0 ** (self.consecutive_failures - 1))
+
+    def stats(self) -> Dict[str, Any]:
+        p50 = self.latency_percentile(50)
+        p95 = self.latency_percentile(95)
+        now = time.monotonic()
+        return {
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "error_rate": round(self.error_rate(now), 3),
+            "samples": len(self.latencies),
+            "in_flight": self.in_flight,
+            "cooling_down": now < self.cooldown_until,
+        }
+
+
+class GeminiRouter:
+    """
+    Routes Gemini calls across a pool of backends (API keys x models x endpoints).
+
+    Each call goes to the healthy backend with the lowest rolling median
+    latency; backends without samples are tried first so that every backend
+    gets measured. If the call is still pending after the chosen backend's
+    `hedge_percentile` latency, a duplicate is sent to the next-best backend
+    and whichever answers first wins. A failed call is retried on another
+    backend. Exposes the same interface as GeminiClient.
+
+    Calls made under a request's latency budget get the remaining time as
+    their timeout and raise TimeoutError once the budget has run out.
+    """
+
+    min_hedge_samples = 10
+
+    def __init__(
+        self,
+        clients: List[GeminiClient],
+        hedge_percentile: float = config.GEMINI_HEDGE_PERCENTILE,
+        max_error_rate: float = config.GEMINI_MAX_ERROR_RATE,
+        max_attempts: int = 2,
+    ):
+        if not clients:
+            raise ValueError("At least one Gemini backend is required.")
+        self.backends = [GeminiBackend(client) for client in clients]
+        self.hedge_percentile = hedge_percentile
+        self.max_error_rate = max_error_rate
+        self.max_attempts = max_attempts
+        self.hedges = 0
+
+    @classmethod
+    def from_config(cls) -> "GeminiRouter":
+        base_urls = config.GEMINI_API_BASE_URLS
+        if len(set(config.GEMINI_API_KEYS)) > 1 and base_urls == [""]:
+            base_urls = [config.GEMINI_REST_URL]
+        clients = [
+            GeminiClient(api_key=key, model_name=model, base_url=base_url)
+            for key, model, base_url in itertools.product(config.GEMINI_API_KEYS, config.GEMINI_MODELS, base_urls)
+        ]
+        return cls(clients)
+
+    async def generate_text(self, prompt: str) -> str:
+        with profiling.waiting("gemini"):
+            return await self._call(lambda client, timeout: client.generate_text(prompt, timeout))
+
+    async def generate_from_pdf(self, prompt: str, pdf_content: bytes) -> str:
+        with profiling.waiting("gemini"):
+            return await self._call(lambda client, timeout: client.generate_from_pdf(prompt, pdf_content, timeout))
+
+    def ranked_backends(self) -> List[GeminiBackend]:
+        """Backends from most to least preferred"""
+        now = time.monotonic()
+
+        def score(backend: GeminiBackend):
+            p50 = backend.latency_percentile(50)
+            return (
+                not backend.healthy(now, self.max_error_rate),
+                p50 is not None,  # unmeasured backends first
+                p50 or 0.0,
+                backend.in_flight,
+            )
+
+        return sorted(self.backends, key=score)
+
+    def hedge_delay(self, backend: GeminiBackend) -> Optional[float]:
+        if self.hedge_percentile <= 0 or len(self.backends) < 2:
+            return None
+        if len(backend.latencies) < self.min_hedge_samples:
+            return None
+        return backend.latency_percentile(self.hedge_percentile)
+
+    async def _attempt(self, backend: GeminiBackend, request: GeminiRequest) -> str:
+        backend.in_flight += 1
+        start = time.monotonic()
+        try:
+            result = await request(backend.client, budget.remaining())
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Running out of the caller's budget isn't the backend's fault
+            if not budget.expired():
+                backend.record_failure(time.monotonic())
+            raise
+        finally:
+            backend.in_flight -= 1
+        backend.record_success(time.monotonic() - start)
+        return result
+
+    async def _call(self, request: GeminiRequest) -> str:
+        if budget.expired():
+            raise TimeoutError("The latency budget ran out before Gemini was called.")
+        candidates = self.ranked_backends()
+        attempts = min(self.max_attempts, len(candidates))
+        pending = set()
+        tasks: Dict[asyncio.Task, GeminiBackend] = {}
+        last_error: Optional[BaseException] = None
+        next_index = 0
+
+        def launch() -> None:
+            nonlocal next_index
+            backend = candidates[next_index]
+            next_index += 1
+            task = asyncio.ensure_future(self._attempt(backend, request))
+            task.add_done_callback(_retrieve_exception)
+            tasks[task] = backend
+            pending.add(task)
+
+        launch()
+        try:
+            while pending:
+                hedge_delay = None
+                if next_index < attempts and len(pending) == 1:
+                    hedge_delay = self.hedge_delay(tasks[next(iter(pending))])
+                timeout = hedge_delay
+                remaining = budget.remaining()
+                if remaining is not None and (timeout is None or remaining < timeout):
+                    timeout, hedge_delay = remaining, None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    if budget.expired():
+                        raise TimeoutError("Gemini did not answer within the latency budget.")
+                    if hedge_delay is not None:
+                        # Still waiting past the latency threshold: hedge on the next backend
+                        self.hedges += 1
+                        launch()
+                    continue
+                for task in done:
+                    pending.discard(task)
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+                if not pending and next_index < attempts and not budget.expired():
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+        if budget.expired():
+            raise TimeoutError("Gemini did not answer within the latency budget.") from last_error
+        raise last_error
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hedges": self.hedges,
+            "backends": {backend.name: backend.stats() for backend in self.backends},
+        }
@@ -0,0 +1,284 @@
+import json
+import math
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from app import config
+from app.extractors.pdf_extractor import PDFExtractor
+from app.models.resume_model import CandidateMatch
+from app.services.extraction_cache import ExtractionCache, extraction_cache
+
+
+class SkillIndex:
+    """
+    Binary skill/topic vectors of candidates, stored as the rows of a CSR matrix.
+
+    Rows are appended to growable arrays (the capacity doubles when full), so
+    adding a candidate costs O(its features) and `matrix()` wraps the arrays
+    without copying them. `add_many` appends a whole batch with a few array
+    operations, which is how the index is built at startup. Adding a candidate again deactivates its old row;
+    dead rows are compacted away once they make up half of the matrix.
+    Document frequencies are kept up to date for the IDF weights.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.features: Dict[str, int] = {}
+        self.feature_names: List[str] = []
+        self.candidate_ids: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.nnz = 0
+        # Bumped on every change, so derived values can be cached between changes
+        self.version = 0
+        self._indptr = np.zeros(capacity + 1, dtype=np.int32)
+        self._indices = np.zeros(capacity * 16, dtype=np.int32)
+        self._data = np.ones(capacity * 16, dtype=np.float64)
+        self._active = np.zeros(capacity, dtype=bool)
+        self._df = np.zeros(256, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def feature_ids(self, features: Iterable[str], create: bool = False) -> np.ndarray:
+        """Sorted column ids of `features`; unknown features are added if `create`, else skipped"""
+        return np.array(self._columns(features, create), dtype=np.int32)
+
+    def _columns(self, features: Iterable[str], create: bool) -> List[int]:
+        ids = set()
+        for feature in features:
+            column = self.features.get(feature)
+            if column is None and create:
+                column = len(self.feature_names)
+                self.features[feature] = column
+                self.feature_names.append(feature)
+            if column is not None:
+                ids.add(column)
+        return sorted(ids)
+
+    def add(self, candidate_id: str, features: Iterable[str]) -> None:
+        self.add_many([(candidate_id, features)])
+
+    def add_many(self, candidates: Iterable[Tuple[str, Iterable[str]]]) -> None:
+        """Add (or replace) candidates; the last features win for a repeated id"""
+        latest = dict(candidates)
+        if not latest:
+            return
+        for candidate_id in latest:
+            self.remove(candidate_id)
+        columns: List[int] = []
+        lengths = []
+        for features in latest.values():
+            row_columns = self._columns(features, create=True)
+            columns.extend(row_columns)
+            lengths.append(len(row_columns))
+
+        first = len(self.candidate_ids)
+        last = first + len(latest)
+        self._reserve(last, self.nnz + len(columns))
+        self._indices[self.nnz:self.nnz + len(columns)] = columns
+        self._indptr[first + 1:last + 1] = self.nnz + np.cumsum(lengths)
+        self.nnz += len(columns)
+        self._active[first:last] = True
+        self.rows.update(zip(latest, range(first, last)))
+        self.candidate_ids.extend(latest)
+        if columns:
+            self._df[:len(self.feature_names)] += np.bincount(columns, minlength=len(self.feature_names))
+        self.version += 1
+
+    def remove(self, candidate_id: str) -> None:
+        row = self.rows.pop(candidate_id, None)
+        if row is None:
+            return
+        self._active[row] = False
+        self._df[self.row_features(row)] -= 1
+        self.version += 1
+        dead = len(self.candidate_ids) - len(self.rows)
+        if dead > 1024 and dead * 2 > len(self.candidate_ids):
+            self._compact()
+
+    def row_features(self, row: int) -> np.ndarray:
+        return self._indices[self._indptr[row]:self._indptr[row + 1]]
+
+    def matrix(self) -> sparse.csr_matrix:
+        """All rows (including inactive ones) as a CSR matrix sharing the index's arrays"""
+        rows = len(self.candidate_ids)
+        return sparse.csr_matrix(
+            (self._data[:self.nnz], self._indices[:self.nnz], self._indptr[:rows + 1]),
+            shape=(rows, len(self.feature_names)),
+            copy=False,
+        )
+
+    @property
+    def active(self) -> np.ndarray:
+        return self._active[:len(self.candidate_ids)]
+
+    def document_frequencies(self) -> np.ndarray:
+        return self._df[:len(self.feature_names)]
+
+    def _reserve(self, rows: int, nnz: int) -> None:
+        if rows + 1 > len(self._indptr):
+            size = max(rows + 1, 2 * len(self._indptr))
+            self._indptr = _grow(self._indptr, size)
+            self._active = _grow(self._active, size - 1)
+        if nnz > len(self._indices):
+            size = max(nnz, 2 * len(self._indices))
+            self._indices = _grow(self._indices, size)
+            self._data = np.ones(size, dtype=np.float64)
+        if len(self.feature_names) > len(self._df):
+            self._df = _grow(self._df, max(len(self.feature_names), 2 * len(self._df)))
+
+    def _compact(self) -> None:
+        live = [
+            (candidate_id, [self.feature_names[column] for column in self.row_features(row)])
+            for candidate_id, row in self.rows.items()
+        ]
+        self.candidate_ids, self.rows, self.nnz = [], {}, 0
+        self._active[:] = False
+        self._df[:] = 0
+        self.add_many(live)
+
+
+def _grow(array: np.ndarray, size: int) -> np.ndarray:
+    grown = np.zeros(size, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class MatchingService:
+    """
+    Ranks stored candidates against a job description.
+
+    Every candidate extracted with a `candidate_id` (standard or Gemini, the
+    refined resume if there is one) is encoded as a vector of the skills from
+    the extractor's vocabulary plus its interview topics, and new or updated
+    candidates are picked up from the extraction cache before each query. The
+    job description goes through the same skill matcher, and candidates are
+    ranked by cosine similarity with IDF weights (topics weighted by
+    MATCH_TOPIC_WEIGHT), which comes down to two sparse matrix-vector products.
+
+    The index lives in memory. `warm` builds it at startup (in the parent
+    process when workers are forked, so they inherit it), and queries only
+    catch up with what changed since. Refreshes and queries are serialized by
+    a lock, so they can run in threads off the event loop.
+    """
+
+    namespaces = ["standard", "gemini"]
+
+    def __init__(
+        self,
+        cache: ExtractionCache = extraction_cache,
+        pdf_extractor: Optional[PDFExtractor] = None,
+        topic_weight: float = config.MATCH_TOPIC_WEIGHT,
+    ):
+        self.cache = cache
+        self.pdf_extractor = pdf_extractor or PDFExtractor()
+        self.topic_weight = topic_weight
+        self.vocabulary = set(self.pdf_extractor.common_skills)
+        self.index = SkillIndex()
+        self._updated_at: Dict[str, float] = {}
+        self._since = 0.0
+        self._row_norms: Tuple[int, Optional[np.ndarray], Optional[np.ndarray]] = (-1, None, None)
+        self._lock = threading.Lock()
+        # Resumes spell the same skills over and over
+        self._skill_feature = lru_cache(maxsize=8192)(self._skill_feature_uncached)
+
+    def features(self, skills: Iterable[str], topics: Iterable[str]) -> List[str]:
+        """Feature names of a resume: vocabulary skills (case-insensitive) and interview topics"""
+        features = [feature for feature in map(self._skill_feature, skills) if feature is not None]
+        features.extend(f"topic:{topic}" for topic in topics)
+        return features
+
+    def _skill_feature_uncached(self, skill: str) -> Optional[str]:
+        skill = skill.strip().lower()
+        return f"skill:{skill}" if skill in self.vocabulary else None
+
+    def warm(self) -> None:
+        """Build the index from all stored candidates, so the first query doesn't have to"""
+        try:
+            with self._lock:
+                self._refresh()
+                self._weights()
+        except Exception as e:
+            print(f"Error building the matching index: {e}")
+
+    def refresh(self) -> None:
+        """Index candidates stored or updated since the last refresh"""
+        with self._lock:
+            self._refresh()
+
+    def _refresh(self) -> None:
+        # Look back a little: concurrent writers may commit slightly out of order
+        rows = self.cache.skills_since(self.namespaces, self._since - 1.0)
+        candidates = []
+        for candidate_id, updated_at, skills_json, topics_json in rows:
+            if self._updated_at.get(candidate_id, -math.inf) >= updated_at:
+                continue
+            skills = json.loads(skills_json) if skills_json else []
+            topics = json.loads(topics_json) if topics_json else []
+            candidates.append((candidate_id, self.features(skills, topics)))
+            self._updated_at[candidate_id] = updated_at
+            self._since = max(self._since, updated_at)
+        self.index.add_many(candidates)
+
+    def match(self, job_description: str, top_k: int = 10) -> Tuple[List[str], List[CandidateMatch]]:
+        """The skills found in the job description and the `top_k` best matching candidates"""
+        with self._lock:
+            self._refresh()
+            return self._match(job_description, top_k)
+
+    def _match(self, job_description: str, top_k: int) -> Tuple[List[str], List[CandidateMatch]]:
+        skills = self.pdf_extractor._extract_skills(job_description)
+        topics = self.pdf_extractor._generate_interview_topics(skills)
+        query = self.index.feature_ids(self.features(skills, topics))
+        if len(self.index) == 0 or len(query) == 0:
+            return skills, []
+
+        squared_weights, row_norms = self._weights()
+        query_weights = np.zeros(len(self.index.feature_names), dtype=np.float64)
+        query_weights[query] = squared_weights[query]
+        query_norm = math.sqrt(query_weights.sum())
+        if query_norm == 0:
+            return skills, []
+
+        scores = self.index.matrix() @ query_weights
+        np.divide(scores, row_norms * query_norm, out=scores, where=row_norms > 0)
+        scores[~self.index.active | (row_norms == 0)] = 0.0
+
+        top_k = min(top_k, len(scores))
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        query_set = set(query.tolist())
+        matches = []
+        for row in best:
+            if scores[row] <= 0:
+                break
+            matched = [self.index.feature_names[column] for column in self.index.row_features(row) if column in query_set]
+            matches.append(CandidateMatch(
+                candidate_id=self.index.candidate_ids[row],
+                score=round(float(scores[row]), 4),
+                matched_skills=[
+                    " ".join(word.capitalize() for word in name[len("skill:"):].split())
+                    for name in matched if name.startswith("skill:")
+                ],
+                matched_topics=[name[len("topic:"):] for name in matched if name.startswith("topic:")],
+            ))
+        return skills, matches
+
+    def _weights(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Squared feature weights (group weight x IDF) and the weighted norm of every row"""
+        version, squared_weights, row_norms = self._row_norms
+        if version == self.index.version:
+            return squared_weights, row_norms
+        df = self.index.document_frequencies()
+        idf = np.log((1 + len(self.index)) / (1 + df)) + 1.0
+        group = np.array([
+            self.topic_weight if name.startswith("topic:") else 1.0 for name in self.index.feature_names
+        ])
+        squared_weights = (group * idf) ** 2
+        # Vectors are binary, so |w * x|^2 is X @ w^2
+        row_norms = np.sqrt(self.index.matrix() @ squared_weights)
+        self._row_norms = (self.index.version, squared_weights, row_norms)
+        return squared_weights, row_norms
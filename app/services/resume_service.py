@@ -1,38 +1,73 @@
+from typing import List, Optional, Tuple
+
 from app.extractors.pdf_extractor import PDFExtractor
 from app.models.resume_model import Resume
+from app.services.extraction_cache import ExtractionCache, extraction_cache
 
 
 class ResumeService:
-    def __init__(self):
+    def __init__(self, cache: ExtractionCache = extraction_cache):
         self.pdf_extractor = PDFExtractor()
+        self.cache = cache
     
-    async def extract_resume_data(self, file_content: bytes, file_extension: str) -> Resume:
+    async def extract_resume_data(
+        self, file_content: bytes, file_extension: str, fields: Optional[List[str]] = None
+    ) -> Resume:
         """
         Extract data from resume file based on file type
         
         Args:
             file_content: The binary content of the uploaded file
             file_extension: The file extension (pdf, docx, etc.)
+            fields: Only extract these fields (and their dependencies); all if None
             
         Returns:
             Resume object with extracted data
         """
         if file_extension.lower() == 'pdf':
-            return self.pdf_extractor.extract_from_pdf(file_content)
+            return self.pdf_extractor.extract_from_pdf(file_content, fields)
         else:
             # For now, we only support PDF. Can extend later.
             raise ValueError(f"Unsupported file format: {file_extension}")
     
-    def validate_extraction(self, resume: Resume) -> bool:
+    async def extract_resume_data_incremental(
+        self, file_content: bytes, file_extension: str, candidate_id: str
+    ) -> Tuple[Resume, List[str]]:
+        """
+        Extract data from a (possibly revised) resume of a known candidate,
+        re-running only the extraction steps of sections that changed since
+        the candidate's previous upload
+        
+        Args:
+            file_content: The binary content of the uploaded file
+            file_extension: The file extension (pdf, docx, etc.)
+            candidate_id: Identifier under which the previous extraction is stored
+            
+        Returns:
+            Resume object and the list of recomputed sections
+        """
+        if file_extension.lower() != 'pdf':
+            raise ValueError(f"Unsupported file format: {file_extension}")
+        previous = self.cache.get("standard", candidate_id)
+        resume, snapshot, recomputed = self.pdf_extractor.extract_incremental(file_content, previous)
+        self.cache.put("standard", candidate_id, snapshot)
+        return resume, recomputed
+    
+    def validate_extraction(self, resume: Resume, fields: Optional[List[str]] = None) -> bool:
         """
         Validate if the extraction was successful
         
         Args:
             resume: The extracted Resume object
+            fields: The fields that were requested, if not all of them
             
         Returns:
             True if extraction was reasonably successful
         """
+        # Only some fields were requested: at least one of them must have been found
+        if fields is not None:
+            return any(getattr(resume, field) not in ("Not Present", []) for field in fields)
+        
         # Check if at least some critical fields were extracted
         if resume.name == "Not Present" and resume.email == "Not Present" and not resume.skills:
             return False
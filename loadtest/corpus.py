@@ -0,0 +1,120 @@
+import os
+import random
+from typing import List, Tuple
+
+FIRST_NAMES = ["John", "Priya", "Maria", "Wei", "Ahmed", "Olga", "Carlos", "Aisha"]
+LAST_NAMES = ["Smith", "Sharma", "Garcia", "Chen", "Khan", "Ivanova", "Lopez", "Okafor"]
+SKILLS = [
+    "Python", "Java", "JavaScript", "SQL", "React", "Docker", "Kubernetes", "AWS",
+    "Spring", "Django", "PostgreSQL", "Redis", "Git", "Microservices", "REST", "Kafka",
+]
+COMPANIES = ["Acme Technologies", "Globex Corporation", "Initech Solutions", "Umbrella Systems"]
+POSITIONS = ["Software Engineer", "Senior Backend Developer", "Data Engineer", "Full Stack Developer"]
+
+
+def load_corpus(directory: str) -> List[Tuple[str, bytes]]:
+    """Load every PDF under `directory` as (filename, content) pairs"""
+    corpus = []
+    for root, _, files in os.walk(directory):
+        for filename in sorted(files):
+            if filename.lower().endswith(".pdf"):
+                with open(os.path.join(root, filename), "rb") as f:
+                    corpus.append((filename, f.read()))
+    if not corpus:
+        raise ValueError(f"No PDF files found in {directory}")
+    return corpus
+
+
+def synthetic_corpus(size: int = 12, seed: int = 0) -> List[Tuple[str, bytes]]:
+    """
+    Generate a mixed corpus of text-layer resume PDFs: short one-page resumes
+    up to long multi-page ones, so the load test exercises different parse costs.
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(size):
+        jobs = rng.choice([1, 2, 4, 8, 16])
+        lines = _resume_lines(rng, jobs)
+        corpus.append((f"synthetic_{i:03d}_{jobs}jobs.pdf", build_pdf(lines)))
+    return corpus
+
+
+def _resume_lines(rng: random.Random, jobs: int) -> List[str]:
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    lines = [
+        f"{first} {last}",
+        f"{first.lower()}.{last.lower()}@gmail.com | +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+        f"linkedin.com/in/{first.lower()}-{last.lower()} | github.com/{first.lower()}{last.lower()}",
+        "",
+        "Education",
+        "State University, Springfield",
+        f"B.Tech in Computer Science 2014 - 2018 CGPA: {rng.uniform(6, 10):.2f}/10",
+        "",
+        "Experience",
+    ]
+    for _ in range(jobs):
+        start = rng.randint(2012, 2022)
+        lines += [
+            rng.choice(COMPANIES),
+            f"{rng.choice(POSITIONS)} {start} - {start + rng.randint(1, 3)}",
+            f"- Built services in {rng.choice(SKILLS)} and {rng.choice(SKILLS)}.",
+            f"- Improved throughput of the {rng.choice(SKILLS)} pipeline by {rng.randint(10, 80)}%.",
+            "",
+        ]
+    lines += [
+        "Skills",
+        ", ".join(rng.sample(SKILLS, 8)),
+        "",
+        "Projects",
+        f"Resume Parser | {rng.choice(SKILLS)}, {rng.choice(SKILLS)} | 2023",
+        "- Parsed resumes into structured JSON.",
+        "",
+        "Achievements",
+        "- Won the internal hackathon.",
+    ]
+    return lines
+
+
+def build_pdf(lines: List[str], lines_per_page: int = 50) -> bytes:
+    """Build a minimal PDF with a text layer (Helvetica, one line per text row)"""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    font_id = 3
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        font_id: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    kids = []
+    next_id = 4
+    for page_lines in pages:
+        page_id, content_id = next_id, next_id + 1
+        next_id += 2
+        kids.append(f"{page_id} 0 R")
+        stream = "BT /F1 11 Tf 14 TL 50 780 Td " + " ".join(
+            f"({_escape(line)}) Tj T*" for line in page_lines
+        ) + " ET"
+        stream_bytes = stream.encode("latin-1", "replace")
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode()
+        objects[content_id] = (
+            f"<< /Length {len(stream_bytes)} >>\nstream\n".encode() + stream_bytes + b"\nendstream"
+        )
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += f"{obj_id} 0 obj\n".encode() + objects[obj_id] + b"\nendobj\n"
+    xref_offset = len(out)
+    size = max(objects) + 1
+    out += f"xref\n0 {size}\n0000000000 65535 f \n".encode()
+    for obj_id in range(1, size):
+        out += f"{offsets[obj_id]:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
@@ -0,0 +1,117 @@
+"""
+Local stand-in for the Gemini REST API used by the load-test harness.
+
+Serves `POST /v1beta/models/{model}:generateContent` with a canned resume JSON
+after a configurable latency, and fails a configurable fraction of requests.
+
+    python -m loadtest.fake_gemini --port 9000 --latency-ms 800 --latency-sigma 0.5 --errors 500=0.02,429=0.01
+"""
+import argparse
+import asyncio
+import json
+import random
+from typing import Dict
+
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+CANNED_RESUME = {
+    "name": "John Smith",
+    "email": "john.smith@gmail.com",
+    "phone": "+15553045262",
+    "linkedin": "linkedin.com/in/john-smith",
+    "github": "github.com/johnsmith",
+    "skills": ["Python", "Java", "SQL", "Docker"],
+    "education": [{
+        "institution": "State University",
+        "location": "Springfield",
+        "degree": "B.Tech of Computer Science",
+        "cgpa": "8.10/10",
+        "period": "2014-2018",
+    }],
+    "experience": [{
+        "company": "Acme Technologies",
+        "position": "Software Engineer",
+        "location": "Springfield",
+        "period": "2019 - Present",
+        "responsibilities": ["Built services in Python and Docker."],
+    }],
+    "projects": [],
+    "achievements": ["Won the internal hackathon."],
+    "interview_topics": ["Python Programming", "Database Management System"],
+}
+
+
+def parse_errors(spec: str) -> Dict[int, float]:
+    """Parse an error distribution like "500=0.02,429=0.01" into {status: probability}"""
+    errors = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        status, probability = item.split("=")
+        errors[int(status)] = float(probability)
+    if sum(errors.values()) > 1:
+        raise ValueError("Error probabilities must add up to at most 1")
+    return errors
+
+
+def create_app(
+    latency_ms: float = 500.0,
+    latency_sigma: float = 0.0,
+    errors: Dict[int, float] = None,
+    seed: int = None,
+) -> FastAPI:
+    """
+    Build the fake server. Latency is log-normal with median `latency_ms` and
+    shape `latency_sigma` (0 gives a fixed latency).
+    """
+    errors = errors or {}
+    rng = random.Random(seed)
+    app = FastAPI(title="Fake Gemini API")
+    app.state.requests = 0
+
+    @app.post("/v1beta/models/{model}:generateContent")
+    async def generate_content(model: str):
+        app.state.requests += 1
+        delay = latency_ms * (rng.lognormvariate(0, latency_sigma) if latency_sigma > 0 else 1)
+        await asyncio.sleep(delay / 1000)
+
+        roll = rng.random()
+        for status, probability in errors.items():
+            if roll < probability:
+                return JSONResponse(
+                    status_code=status,
+                    content={"error": {"code": status, "message": "Injected fake Gemini error"}},
+                )
+            roll -= probability
+
+        return {
+            "candidates": [{
+                "content": {"role": "model", "parts": [{"text": json.dumps(CANNED_RESUME)}]},
+                "finishReason": "STOP",
+            }],
+            "modelVersion": model,
+        }
+
+    @app.get("/")
+    async def health():
+        return {"requests": app.state.requests}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Gemini API server for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency-ms", type=float, default=500.0, help="Median response latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.0, help="Log-normal shape of the latency")
+    parser.add_argument("--errors", default="", help='Error distribution, e.g. "500=0.02,429=0.01"')
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    app = create_app(args.latency_ms, args.latency_sigma, parse_errors(args.errors), args.seed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
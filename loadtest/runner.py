@@ -0,0 +1,260 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from loadtest.corpus import load_corpus, synthetic_corpus
+
+ENDPOINTS = {
+    "extract": "/api/v1/resume/extract",
+    "gemini-extract": "/api/v1/resume/gemini-extract",
+    "extract-gemini-direct": "/api/v1/resume/extract-gemini-direct",
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse an endpoint mix like "extract=2,gemini-extract=1" into weights"""
+    mix = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, weight = item.split("=")
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint {name}, expected one of {', '.join(ENDPOINTS)}")
+        mix[name] = float(weight)
+    return mix
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an unsorted list"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered) + 0.5 - 1e-9)))
+    return round(ordered[min(rank, len(ordered)) - 1], 2)
+
+
+def wait_until_ready(url: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Process serving {url} exited with code {process.returncode}")
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Timed out waiting for {url}")
+
+
+class LoadTest:
+    """
+    Open-loop load test of the API against a local fake Gemini server.
+
+    Requests arrive as a Poisson process at `rate` requests/second regardless
+    of how fast the service answers, and latency is measured from the
+    scheduled arrival time so that queueing delay is not hidden.
+    """
+
+    def __init__(
+        self,
+        corpus: List[Tuple[str, bytes]],
+        mix: Dict[str, float],
+        rate: float,
+        duration: float,
+        request_timeout: float = 60.0,
+        seed: int = 0,
+    ):
+        self.corpus = corpus
+        self.mix = mix
+        self.rate = rate
+        self.duration = duration
+        self.request_timeout = request_timeout
+        self.rng = random.Random(seed)
+        self.results: List[Dict[str, Any]] = []
+
+    async def run(self, base_url: str) -> Dict[str, Any]:
+        names = list(self.mix)
+        weights = [self.mix[name] for name in names]
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=100)
+        async with httpx.AsyncClient(base_url=base_url, timeout=self.request_timeout, limits=limits) as client:
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            tasks = []
+            offset = self.rng.expovariate(self.rate)
+            while offset < self.duration:
+                await asyncio.sleep(max(0.0, start + offset - loop.time()))
+                endpoint = self.rng.choices(names, weights)[0]
+                filename, content = self.rng.choice(self.corpus)
+                tasks.append(asyncio.create_task(
+                    self._request(client, endpoint, filename, content, start + offset)
+                ))
+                offset += self.rng.expovariate(self.rate)
+            await asyncio.gather(*tasks)
+            elapsed = loop.time() - start
+        return self.report(elapsed)
+
+    async def _request(self, client, endpoint, filename, content, scheduled) -> None:
+        loop = asyncio.get_running_loop()
+        result = {"endpoint": endpoint, "outcome": "error", "status": None}
+        try:
+            response = await client.post(
+                ENDPOINTS[endpoint],
+                files={"file": (filename, content, "application/pdf")},
+                headers={"X-Request-Timeout": str(self.request_timeout)},
+            )
+            result["status"] = response.status_code
+            if response.status_code == 503:
+                result["outcome"] = "rejected"
+            elif response.status_code == 200:
+                result["outcome"] = "success" if response.json().get("success") else "failed"
+        except httpx.HTTPError as e:
+            result["status"] = type(e).__name__
+        result["latency_ms"] = (loop.time() - scheduled) * 1000
+        self.results.append(result)
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        report = {
+            "elapsed_s": round(elapsed, 2),
+            "overall": self._summarize(self.results, elapsed),
+            "endpoints": {},
+        }
+        for endpoint in self.mix:
+            results = [r for r in self.results if r["endpoint"] == endpoint]
+            report["endpoints"][endpoint] = self._summarize(results, elapsed)
+        return report
+
+    @staticmethod
+    def _summarize(results: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+        outcomes = {"success": 0, "failed": 0, "rejected": 0, "error": 0}
+        statuses: Dict[str, int] = {}
+        for r in results:
+            outcomes[r["outcome"]] += 1
+            statuses[str(r["status"])] = statuses.get(str(r["status"]), 0) + 1
+        latencies = [r["latency_ms"] for r in results]
+        success_latencies = [r["latency_ms"] for r in results if r["outcome"] == "success"]
+        total = len(results)
+        return {
+            "requests": total,
+            **outcomes,
+            "statuses": statuses,
+            "throughput_rps": round(outcomes["success"] / elapsed, 2) if elapsed else 0.0,
+            "error_rate": round((total - outcomes["success"]) / total, 4) if total else 0.0,
+            "latency_ms": {
+                "p50": percentile(latencies, 50),
+                "p95": percentile(latencies, 95),
+                "p99": percentile(latencies, 99),
+                "max": round(max(latencies), 2) if latencies else None,
+            },
+            "success_latency_ms": {
+                "p50": percentile(success_latencies, 50),
+                "p95": percentile(success_latencies, 95),
+                "p99": percentile(success_latencies, 99),
+            },
+        }
+
+
+def start_fake_gemini(args, latency_ms: str, seed: int) -> Tuple[subprocess.Popen, str]:
+    port = free_port()
+    command = [
+        sys.executable, "-m", "loadtest.fake_gemini", "--port", str(port),
+        "--latency-ms", latency_ms,
+        "--latency-sigma", str(args.gemini_latency_sigma),
+        "--errors", args.gemini_errors,
+        "--seed", str(seed),
+    ]
+    process = subprocess.Popen(command)
+    url = f"http://127.0.0.1:{port}"
+    wait_until_ready(url + "/", process)
+    return process, url
+
+
+def start_app(args, gemini_urls: List[str]) -> Tuple[subprocess.Popen, str]:
+    port = free_port()
+    env = dict(os.environ)
+    env.update({
+        "RESUME_HOST": "127.0.0.1",
+        "RESUME_PORT": str(port),
+        "RESUME_WORKERS": str(args.workers),
+        "GEMINI_API_BASE_URL": gemini_urls[0],
+        "GEMINI_API_BASE_URLS": ",".join(gemini_urls),
+        "GEMINI_API_KEY": "fake-key",
+    })
+    output = None if args.verbose else subprocess.DEVNULL
+    process = subprocess.Popen([sys.executable, "-m", "app.main"], env=env, stdout=output, stderr=output)
+    url = f"http://127.0.0.1:{port}"
+    wait_until_ready(url + "/", process)
+    return process, url
+
+
+def stop(process: subprocess.Popen) -> None:
+    if process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Open-loop load test of the Resume Extractor API")
+    parser.add_argument("--rate", type=float, default=10.0, help="Arrival rate in requests/second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to generate load for")
+    parser.add_argument("--mix", default="extract=1,gemini-extract=1,extract-gemini-direct=1",
+                        help="Endpoint weights, e.g. extract=2,gemini-extract=1")
+    parser.add_argument("--corpus", help="Directory of PDF files (default: generated synthetic resumes)")
+    parser.add_argument("--workers", type=int, default=1, help="RESUME_WORKERS for the app under test")
+    parser.add_argument("--target", help="URL of an already running app (skips starting the app and fake Gemini)")
+    parser.add_argument("--gemini-latency-ms", default="500",
+                        help="Median fake Gemini latency; a comma-separated list starts one fake backend per value")
+    parser.add_argument("--gemini-latency-sigma", type=float, default=0.3)
+    parser.add_argument("--gemini-errors", default="500=0.01,429=0.01")
+    parser.add_argument("--request-timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--verbose", action="store_true", help="Show the app's log output")
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus(seed=args.seed)
+    load_test = LoadTest(corpus, parse_mix(args.mix), args.rate, args.duration, args.request_timeout, args.seed)
+
+    processes = []
+    try:
+        if args.target:
+            base_url = args.target
+        else:
+            gemini_urls = []
+            for i, latency_ms in enumerate(args.gemini_latency_ms.split(",")):
+                fake, gemini_url = start_fake_gemini(args, latency_ms.strip(), args.seed + i)
+                processes.append(fake)
+                gemini_urls.append(gemini_url)
+            app, base_url = start_app(args, gemini_urls)
+            processes.append(app)
+        report = asyncio.run(load_test.run(base_url))
+    finally:
+        for process in reversed(processes):
+            stop(process)
+
+    report["config"] = {
+        key: value for key, value in vars(args).items() if key not in ("output", "verbose")
+    }
+    report["config"]["corpus_files"] = len(corpus)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
@@ -0,0 +1,53 @@
+import asyncio
+
+from fastapi import HTTPException, Response
+
+from app.admission import AdmissionController
+
+
+class _Request:
+    headers = {}
+
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+async def _call(controller: AdmissionController, release: asyncio.Event) -> int:
+    try:
+        async with controller.admit(_Request(), Response()):
+            await release.wait()
+        return 200
+    except HTTPException as e:
+        return e.status_code
+
+
+def test_burst_at_idle_endpoint_respects_queue_limit():
+    async def burst():
+        controller = AdmissionController("test", max_concurrency=1, max_queue=1)
+        release = asyncio.Event()
+        calls = [asyncio.ensure_future(_call(controller, release)) for _ in range(4)]
+        await asyncio.sleep(0.01)
+        release.set()
+        statuses = await asyncio.gather(*calls)
+        return controller, statuses
+
+    controller, statuses = asyncio.run(burst())
+    assert sorted(statuses) == [200, 200, 503, 503]
+    assert controller.in_flight == 0
+    assert controller.queued == 0
+    assert controller.active == 0
+
+
+def test_slots_are_freed_after_rejections():
+    async def two_bursts():
+        controller = AdmissionController("test", max_concurrency=1, max_queue=0)
+        statuses = []
+        for _ in range(2):
+            release = asyncio.Event()
+            calls = [asyncio.ensure_future(_call(controller, release)) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            release.set()
+            statuses.append(sorted(await asyncio.gather(*calls)))
+        return statuses
+
+    assert asyncio.run(two_bursts()) == [[200, 503, 503], [200, 503, 503]]
@@ -0,0 +1,33 @@
+import time
+
+from app.models.resume_model import ExtractionSnapshot, Resume
+from app.services.extraction_cache import ExtractionCache
+
+
+def _snapshot(name: str) -> ExtractionSnapshot:
+    return ExtractionSnapshot(refined=Resume(name=name))
+
+
+def test_get_ignores_expired_snapshots(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "cache.sqlite3"))
+    cache.put("gemini_direct", "key", _snapshot("Alice"))
+    cache.connection.execute("UPDATE snapshots SET updated_at = ?", (time.time() - 120,))
+    assert cache.get("gemini_direct", "key", max_age=60) is None
+    assert cache.get("gemini_direct", "key", max_age=600).refined.name == "Alice"
+    assert cache.get("gemini_direct", "key") is not None
+
+
+def test_put_bounded_evicts_expired_and_oldest(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "cache.sqlite3"))
+    cache.put("gemini", "candidate", _snapshot("Kept"))
+    cache.put("gemini_direct", "stale", _snapshot("Stale"))
+    cache.connection.execute("UPDATE snapshots SET updated_at = ?", (time.time() - 7200,))
+    for i in range(5):
+        cache.put_bounded("gemini_direct", f"key{i}", _snapshot(f"R{i}"), max_age=3600, max_entries=3)
+
+    keys = [row[0] for row in cache.connection.execute(
+        "SELECT candidate_id FROM snapshots WHERE namespace = 'gemini_direct' ORDER BY updated_at"
+    )]
+    assert keys == ["key2", "key3", "key4"]
+    # Other namespaces are left alone
+    assert cache.get("gemini", "candidate").refined.name == "Kept"
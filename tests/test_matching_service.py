@@ -0,0 +1,60 @@
+import numpy as np
+
+from app.models.resume_model import ExtractionSnapshot, Resume
+from app.services.extraction_cache import ExtractionCache
+from app.services.matching_service import MatchingService, SkillIndex
+
+
+def _dense(index: SkillIndex) -> np.ndarray:
+    return index.matrix().toarray()[index.active]
+
+
+def test_add_many_matches_adding_one_by_one():
+    candidates = [
+        ("a", ["skill:python", "skill:docker"]),
+        ("b", ["skill:java", "topic:Databases"]),
+        ("a", ["skill:python", "skill:kubernetes"]),
+        ("c", []),
+    ]
+    one_by_one = SkillIndex(capacity=1)
+    for candidate_id, features in candidates:
+        one_by_one.add(candidate_id, features)
+    bulk = SkillIndex(capacity=1)
+    bulk.add_many(candidates)
+
+    def rows(index):
+        return {c: {index.feature_names[f] for f in index.row_features(r)} for c, r in index.rows.items()}
+
+    def df(index):
+        return {f: n for f, n in zip(index.feature_names, index.document_frequencies().tolist()) if n}
+
+    assert rows(bulk) == rows(one_by_one)
+    assert rows(bulk)["a"] == {"skill:python", "skill:kubernetes"}
+    assert df(bulk) == df(one_by_one)
+
+
+def test_compaction_keeps_live_rows():
+    index = SkillIndex(capacity=4)
+    index.add_many((f"c{i}", ["skill:python", f"topic:t{i % 3}"]) for i in range(3000))
+    index.add_many((f"c{i}", ["skill:java"]) for i in range(2500))
+    assert len(index) == 3000
+    assert len(index.candidate_ids) < 5500
+    assert _dense(index).sum() == 2500 + 2 * 500
+    df = dict(zip(index.feature_names, index.document_frequencies().tolist()))
+    assert df["skill:java"] == 2500 and df["skill:python"] == 500
+
+
+def test_warm_builds_index_and_queries_catch_up(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "cache.sqlite3"))
+    cache.put("standard", "alice", ExtractionSnapshot(resume=Resume(skills=["Python", "Docker"])))
+    cache.put("gemini", "bob", ExtractionSnapshot(
+        resume=Resume(skills=["Java"]), refined=Resume(skills=["Java", "Python"]),
+    ))
+    service = MatchingService(cache=cache)
+    service.warm()
+    assert sorted(service.index.rows) == ["alice", "bob"]
+
+    cache.put("standard", "carol", ExtractionSnapshot(resume=Resume(skills=["Python", "Docker", "Kubernetes"])))
+    skills, matches = service.match("Python, Docker and Kubernetes", top_k=3)
+    assert set(skills) == {"Python", "Docker", "Kubernetes"}
+    assert [match.candidate_id for match in matches] == ["carol", "alice", "bob"]
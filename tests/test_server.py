@@ -0,0 +1,53 @@
+import os
+
+import pytest
+
+from app.server import PreforkServer
+
+
+class _Server(PreforkServer):
+    """PreforkServer whose workers exit with `exit_code` as soon as they start"""
+
+    def __init__(self, exit_code: int, **kwargs):
+        super().__init__(workers=1, min_uptime=60.0, **kwargs)
+        self.worker_exit_code = exit_code
+
+    def _serve(self) -> None:
+        if self.worker_exit_code:
+            raise RuntimeError("worker failed to start")
+
+
+def _run_worker(server: PreforkServer, slot: int = 0) -> int:
+    server._spawn_worker(slot)
+    pid = next(pid for pid, s in server.children.items() if s == slot)
+    _, status = os.waitpid(pid, 0)
+    server.children.pop(pid)
+    return status
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_clean_exit_is_respawned_right_away():
+    server = _Server(exit_code=0, max_failed_starts=2)
+    for _ in range(3):
+        status = _run_worker(server)
+        assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+        server._schedule_respawn(0, status)
+        assert server.respawn_at[0] == 0.0
+        assert server.failed_starts[0] == 0
+    assert not server.should_exit
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_crash_at_startup_is_backed_off():
+    server = _Server(exit_code=1, max_failed_starts=3)
+    delays = []
+    for _ in range(2):
+        status = _run_worker(server)
+        before = server.started_at[0]
+        server._schedule_respawn(0, status)
+        delays.append(round(server.respawn_at[0] - before))
+    assert delays == [1, 2]
+
+    server._schedule_respawn(0, _run_worker(server))
+    assert server.should_exit
+    assert server.exit_code == 1